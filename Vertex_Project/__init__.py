@@ -0,0 +1,2009 @@
+import bpy
+import gpu
+import bmesh
+import fnmatch
+import math
+import time
+import mathutils
+import numpy as np
+from mathutils import *
+from .projection import (
+    MISSED,
+    average_normals,
+    plane_axes_from_points,
+    project_along_normals,
+    project_mask_chunked,
+    project_points_on_plane,
+    count_failures,
+    fit_plane,
+    moved_vertices,
+    project_selection,
+    project_selection_on_planes,
+    view_third_point,
+)
+from . import points, precompute, profiling, snapshot, surface, symmetry
+from .preview import decimate_lines, line_positions, visible_lines
+from .snapshot import (
+    read_bmesh_normals,
+    read_mesh_edges,
+    read_mesh_normals,
+    read_mesh_verts,
+    read_shape_key,
+    select_bmesh_elements,
+    select_mesh_elements,
+    set_bmesh_vertex_group,
+    set_mesh_vertex_group,
+    vertex_group_mask,
+    weld_bmesh_verts,
+    write_bmesh_verts,
+    write_mesh_verts,
+    write_shape_key,
+)
+from bpy.app.handlers import persistent
+from bpy.types import Panel, PropertyGroup, AddonPreferences
+from bpy.props import FloatVectorProperty, PointerProperty, BoolProperty, EnumProperty, StringProperty, CollectionProperty, IntProperty, FloatProperty
+from gpu_extras.batch import batch_for_shader
+from bpy_extras.view3d_utils import location_3d_to_region_2d
+
+bl_info = {
+    "name": "Vertex Project",
+    "author": "Kuklach",
+    "version": (0, 4, 0),
+    "blender": (4, 0, 0),
+    "location": "View3D > Sidebar > Kuklach Tools",
+    "description": "Simple addon to fast project edges or vertices on a plane defined by cursor location and normal.",
+    "category": "Tools"
+}
+
+
+def update_preview(self, context):
+    """Drop the cached preview lines and redraw, used by property updates and cursor changes
+
+    Also restarts the background projection with the new settings.
+    """
+    global lines_key
+    lines_key = None
+    obj = bpy.context.active_object
+    if obj is not None and obj.type == 'MESH' and obj.mode == 'EDIT':
+        precompute.schedule(edit_mesh_objects(bpy.context))
+    else:
+        precompute.cancel()
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+class ProjectionPlane(PropertyGroup):
+    """One plane of the plane stack"""
+
+    name: StringProperty(
+        name="Name",
+        default="Plane"
+    )
+
+    origin: FloatVectorProperty(
+        name="Origin",
+        description="Point on the plane",
+        default=(0.0, 0.0, 0.0),
+        subtype='TRANSLATION',
+        update=update_preview
+    )
+
+    normal: FloatVectorProperty(
+        name="Normal",
+        description="Normal vector of the plane",
+        default=(0.0, 0.0, 1.0),
+        min=-1.0,
+        max=1.0,
+        subtype='XYZ',
+        update=update_preview
+    )
+
+    side: EnumProperty(
+        name="Side",
+        description="Side of the plane the elements are projected from",
+        items=[
+            ('POSITIVE', "Positive", "Project elements on the positive side of the plane"),
+            ('NEGATIVE', "Negative", "Project elements on the negative side of the plane"),
+        ],
+        default='POSITIVE'
+    )
+
+
+def poll_target(self, obj):
+    return obj.type == 'MESH'
+
+
+class VertexProjectionProperties(PropertyGroup):
+    """Properties for vertex projection tool"""
+
+    plane_normal: FloatVectorProperty(
+        name="Plane Normal",
+        description="Normal vector of the projection plane",
+        default=(0.0, 1.0, 0.0),
+        min=-1.0,
+        max=1.0,
+        subtype='XYZ',
+        update=update_preview
+    )
+
+    vertex_normal: FloatVectorProperty(
+        name="Vertex Normal",
+        description="Alternative normal vector for vertex projection",
+        default=(0.0, 1.0, 0.0),
+        min=-1.0,
+        max=1.0,
+        subtype='XYZ',
+        update=update_preview
+    )
+
+    auto_set_cursor: BoolProperty(
+        name="Auto Set Cursor",
+        description="Automatically set the cursor position on the projection plane",
+        default=True
+    )
+
+    use_best_fit: BoolProperty(
+        name="Best Fit Plane",
+        description="Fit the plane to all selected vertices instead of the first three",
+        default=False
+    )
+
+    use_vertices_only: BoolProperty(
+        name="Use Vertices Only",
+        description="Project vertices instead of edges",
+        default=False,
+        update=update_preview
+    )
+
+    use_vertex_normal: BoolProperty(
+        name="Use Vertex Normal",
+        description="Use the alternative normal for vertex projection",
+        default=False,
+        update=update_preview
+    )
+    direction_mode: EnumProperty(
+        name="Direction",
+        description="Direction the vertices are projected along in vertex mode",
+        items=[
+            ('GLOBAL', "Plane Normal", "Project along the plane normal, or the vertex normal if it is enabled"),
+            ('OWN', "Own Normals", "Project every vertex along its own normal"),
+            ('AVERAGE', "Averaged Normals", "Project every vertex along its normal averaged with its selected neighbours"),
+        ],
+        default='GLOBAL',
+        update=update_preview
+    )
+
+    use_outside_edges: BoolProperty(
+        name="Use Outside Edges",
+        description="Use edges outside of projection plane",
+        default=True,
+        update=update_preview
+    )
+
+    edge_rule: EnumProperty(
+        name="Shared Vertices",
+        description="How vertices shared by several selected edges are projected",
+        items=[
+            ('SEQUENTIAL', "Edge by Edge", "Apply the edges one after another in index order, each starting from where earlier edges moved its vertices"),
+            ('ORDER', "Edge Order", "Evaluate every edge on the coordinates from before the projection, a shared vertex keeps the result of its last edge"),
+            ('SHORTEST', "Shortest Edge", "Move every vertex once, along its shortest edge"),
+            ('PERPENDICULAR', "Most Perpendicular", "Move every vertex once, along the edge most perpendicular to the plane"),
+        ],
+        default='SEQUENTIAL',
+        update=update_preview
+    )
+
+    select_failed: BoolProperty(
+        name="Select Failed",
+        description="Select the vertices or edges that do not intersect the plane instead of the projected selection",
+        default=False
+    )
+
+    group_failed: BoolProperty(
+        name="Group Failed",
+        description="Put the vertices that do not intersect the plane into the 'Projection Failed' vertex group",
+        default=False
+    )
+
+    use_mirror: BoolProperty(
+        name="Mirror",
+        description="Also project the mirror counterparts of the selection onto the mirrored plane",
+        default=False,
+        update=update_preview
+    )
+
+    mirror_axis: EnumProperty(
+        name="Mirror Axis",
+        description="Local axis the mesh is symmetric along",
+        items=[
+            ('X', "X", "Mirror across the local YZ plane"),
+            ('Y', "Y", "Mirror across the local XZ plane"),
+            ('Z', "Z", "Mirror across the local XY plane"),
+        ],
+        default='X'
+    )
+
+    mirror_tolerance: FloatProperty(
+        name="Mirror Tolerance",
+        description="Largest distance between a mirrored vertex position and its counterpart",
+        default=0.001,
+        min=0.0,
+        subtype='DISTANCE'
+    )
+
+    shape_keys: EnumProperty(
+        name="Shape Keys",
+        description="Shape keys the projection is applied to",
+        items=[
+            ('ACTIVE', "Active Key", "Project the active shape key only"),
+            ('ALL', "All Keys", "Project every shape key with the same selection"),
+            ('FILTER', "Filtered Keys", "Project the shape keys whose name matches the filter"),
+        ],
+        default='ACTIVE'
+    )
+
+    shape_key_filter: StringProperty(
+        name="Shape Key Filter",
+        description="Name pattern of the projected shape keys, * and ? are wildcards",
+        default="*"
+    )
+
+    use_weld: BoolProperty(
+        name="Weld",
+        description="Merge projected vertices that end up within the weld distance of each other",
+        default=False
+    )
+
+    weld_distance: FloatProperty(
+        name="Weld Distance",
+        description="Largest distance between projected vertices that are merged",
+        default=0.0001,
+        min=0.0,
+        subtype='DISTANCE'
+    )
+
+    skip_tolerance: FloatProperty(
+        name="Skip Tolerance",
+        description="Vertices that would move by no more than this are left untouched, "
+                    "so projecting an already projected selection again writes nothing",
+        default=1e-6,
+        min=0.0,
+        precision=6,
+        subtype='DISTANCE'
+    )
+
+    use_streaming: BoolProperty(
+        name="Streaming",
+        description="In object mode, project the selection in fixed size chunks so memory stays flat on very large meshes. "
+                    "Not used with mirror, shape keys, per-vertex directions or a shared vertex rule",
+        default=False
+    )
+
+    chunk_size: IntProperty(
+        name="Chunk Size",
+        description="Number of vertices or edges projected at once in streaming mode",
+        default=262144,
+        min=1024
+    )
+
+    precision: EnumProperty(
+        name="Precision",
+        description="Float precision of the coordinate buffers in streaming mode",
+        items=[
+            ('FLOAT32', "Single", "Work on the mesh data precision directly, half the memory of double precision"),
+            ('FLOAT64', "Double", "Convert the coordinates to double precision before projecting"),
+        ],
+        default='FLOAT32'
+    )
+
+    target_object: PointerProperty(
+        name="Target",
+        description="Mesh object to project the selected vertices onto",
+        type=bpy.types.Object,
+        poll=poll_target
+    )
+
+    surface_direction: EnumProperty(
+        name="Direction",
+        description="Direction of the rays cast onto the target surface",
+        items=[
+            ('PLANE', "Plane Normal", "Cast along the plane normal"),
+            ('VERTEX_NORMAL', "Vertex Normal", "Cast along the alternative vertex normal"),
+            ('OWN', "Own Normals", "Cast along the normal of every vertex"),
+        ],
+        default='PLANE'
+    )
+
+    use_nearest_fallback: BoolProperty(
+        name="Nearest Fallback",
+        description="Move vertices whose rays miss the target to the nearest point of its surface",
+        default=True
+    )
+
+    planes: CollectionProperty(
+        name="Plane Stack",
+        description="Planes the selection is projected against in one pass",
+        type=ProjectionPlane
+    )
+
+    active_plane_index: IntProperty(
+        name="Active Plane",
+        default=0
+    )
+
+class BASE_PANEL:
+    bl_category = "Kuklach Tools"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    #bl_options = {"DEFAULT_CLOSED"}
+
+
+class VertexProjectionPanel(BASE_PANEL, Panel):
+    bl_idname = "ProjectPanel"
+    bl_label = "Vertex Projection"
+    bl_order = 0
+
+    def draw(self, context):
+        layout = self.layout
+        tool_props = bpy.context.scene.vertex_projection_props
+
+        box = layout.box()
+        
+        box.label(text="Set Plane Normal", icon='OUTLINER_OB_EMPTY')
+        row = box.row(align=True)# Add icon for the header
+        row.operator("wm.set_normal", text="X", icon='AXIS_SIDE').normal = 'X'  # Add icon for the button
+        row.operator("wm.set_normal", text="Y", icon='AXIS_FRONT').normal = 'Y'
+        row.operator("wm.set_normal", text="Z", icon='AXIS_TOP').normal = 'Z'
+        row = box.row()
+        row.prop(tool_props, "plane_normal", text="")
+        #box.label(text="Set Normal from Selection", icon='OUTLINER_OB_EMPTY')
+        row = box.row(align=True)
+        row.operator("wm.set_normal_sel", text="Left", icon='AXIS_SIDE').normal = 'X'
+        row.operator("wm.set_normal_sel", text="Front", icon='AXIS_FRONT').normal = 'Y'
+        row.operator("wm.set_normal_sel", text="Up", icon='AXIS_TOP').normal = 'Z'
+        box.prop(tool_props, "use_best_fit", text="Best Fit Plane", icon='MOD_LATTICE')
+
+        box = layout.box()
+        box.label(text="Project Vertices")
+        row = box.row(align=True)
+        row.operator("wm.execute_projection", text='Positive', icon='ADD').is_positive = True
+        row.operator("wm.execute_projection", text='Negative', icon='REMOVE').is_positive = False       
+        row = box.row(align=True)
+        row.operator("wm.execute_projection", text='Closest', icon='FULLSCREEN_EXIT').is_closest = True         
+        row = box.row(align=True)
+        row.operator("wm.interactive_projection", text='Interactive', icon='MOUSE_MOVE')
+        
+        box = layout.box()
+        box.label(text="Project on Surface")
+        box.prop(tool_props, "target_object", text="")
+        row = box.row(align=True)
+        row.prop(tool_props, "surface_direction", text="")
+        row.prop(tool_props, "use_nearest_fallback", text="", icon='SNAP_ON')
+        box.operator("wm.project_on_surface", text='Project on Surface', icon='SNAP_FACE')
+
+        box = layout.box()
+        box.prop(tool_props, "auto_set_cursor", text="Auto Set Cursor", icon='CURSOR')  # Add icon for the property
+        box.prop(tool_props, "use_outside_edges", text="Use Outside Edges", icon='EDGESEL')
+        box.prop(tool_props, "use_vertices_only", text="Use Vertices Only", icon='VERTEXSEL')
+        #box = layout.box()
+        #box.label(text="Project Closest Vertices")
+
+        box = layout.box()
+        box.label(text="Toggle Visual Helpers")
+        box.operator("wm.show_debug", text='Show Helpers', icon='HIDE_OFF')
+
+
+class VertexProjectionStackPanel(BASE_PANEL, Panel):
+    bl_parent_id = "ProjectPanel"
+    bl_label = "Plane Stack"
+    bl_order = 2
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        tool_props = bpy.context.scene.vertex_projection_props
+
+        row = layout.row()
+        row.template_list("UI_UL_list", "vertex_projection_planes", tool_props, "planes", tool_props, "active_plane_index", rows=3)
+        col = row.column(align=True)
+        col.operator("wm.add_stack_plane", text="", icon='ADD')
+        col.operator("wm.remove_stack_plane", text="", icon='REMOVE')
+
+        if 0 <= tool_props.active_plane_index < len(tool_props.planes):
+            plane = tool_props.planes[tool_props.active_plane_index]
+            layout.prop(plane, "origin", text="")
+            layout.prop(plane, "normal", text="")
+            layout.row().prop(plane, "side", expand=True)
+
+        row = layout.row(align=True)
+        row.operator("wm.project_plane_stack", text="First Plane", icon='SORTSIZE').use_nearest = False
+        row.operator("wm.project_plane_stack", text="Nearest Plane", icon='FULLSCREEN_EXIT').use_nearest = True
+
+
+class VertexProjectionOptionsPanel(BASE_PANEL, Panel):
+    bl_parent_id = "ProjectPanel"
+    bl_label = "Vertex Projection Options"
+    bl_order = 1
+    bl_options = {'DEFAULT_CLOSED'}
+    # def draw_header(self, _):
+    #      layout = self.layout
+    #      layout.label(text="", icon='NORMALS_FACE')  # Add icon for the header
+    def draw(self, context):
+        layout = self.layout
+        tool_props = bpy.context.scene.vertex_projection_props
+
+        layout.prop(tool_props, "use_vertex_normal", text="Use Vertex Normal", icon='NORMALS_VERTEX')
+        layout.label(text="Vertex Normal")
+        layout.prop(tool_props, "vertex_normal", text="")
+        layout.prop(tool_props, "direction_mode", text="Direction")
+        layout.prop(tool_props, "edge_rule", text="Shared Vertices")
+        layout.label(text="Elements Not Intersecting the Plane")
+        row = layout.row(align=True)
+        row.prop(tool_props, "select_failed", text="Select", icon='RESTRICT_SELECT_OFF')
+        row.prop(tool_props, "group_failed", text="Vertex Group", icon='GROUP_VERTEX')
+        row = layout.row(align=True)
+        row.prop(tool_props, "use_mirror", text="Mirror", icon='MOD_MIRROR')
+        row.prop(tool_props, "mirror_axis", expand=True)
+        layout.prop(tool_props, "mirror_tolerance")
+        layout.prop(tool_props, "shape_keys", icon='SHAPEKEY_DATA')
+        if tool_props.shape_keys == 'FILTER':
+            layout.prop(tool_props, "shape_key_filter", text="")
+        row = layout.row(align=True)
+        row.prop(tool_props, "use_weld", text="Weld", icon='AUTOMERGE_ON')
+        row.prop(tool_props, "weld_distance", text="")
+        layout.prop(tool_props, "skip_tolerance")
+        row = layout.row(align=True)
+        row.prop(tool_props, "use_streaming", text="Streaming", icon='SEQ_STRIP_DUPLICATE')
+        sub = row.row(align=True)
+        sub.active = tool_props.use_streaming
+        sub.prop(tool_props, "chunk_size", text="")
+        sub.prop(tool_props, "precision", text="")
+        #layout.label(text="You can find settings for this addon in preferences")
+
+
+class VertexProjectionPerformancePanel(BASE_PANEL, Panel):
+    bl_parent_id = "ProjectPanel"
+    bl_label = "Performance"
+    bl_order = 3
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        prefs = context.preferences.addons[__name__].preferences
+
+        row = layout.row(align=True)
+        row.prop(prefs, "enable_profiling", text="Record Timings", icon='TIME')
+        row.prop(prefs, "profile_allocations", text="", icon='MEMORY')
+        layout.prop(prefs, "use_precompute", icon='MOD_TIME')
+        for record in profiling.latest():
+            box = layout.box()
+            box.label(text=f"{record.name}: {record.total * 1000:.2f} ms")
+            for name, seconds in record.phases.items():
+                row = box.row()
+                row.label(text=name)
+                allocated = record.allocated.get(name)
+                row.label(text=f"{allocated / 2 ** 20:.1f} MB" if allocated is not None else "")
+                row.label(text=f"{seconds * 1000:.2f} ms")
+            for name, value in record.counts.items():
+                row = box.row()
+                row.label(text=name)
+                row.label(text=str(value))
+        row = layout.row(align=True)
+        row.operator("wm.export_projection_profile", text="JSON", icon='EXPORT').file_format = 'JSON'
+        row.operator("wm.export_projection_profile", text="CSV", icon='EXPORT').file_format = 'CSV'
+        row.operator("wm.clear_projection_profile", text="", icon='TRASH')
+
+
+def update_profiling(self, context):
+    profiling.set_enabled(self.enable_profiling, self.profile_allocations)
+
+
+def update_precompute(self, context):
+    precompute.set_enabled(self.use_precompute)
+
+
+class VisualDebugOptionsPanel(AddonPreferences):
+    bl_idname = __name__
+
+    icon_thickness: bpy.props.FloatProperty(
+        name="Icon Thickness",
+        description="Thickness of the '+' and '-' icons",
+        default=2.5,
+        min=0.1,
+        max=10.0
+    )
+
+    plane_color: bpy.props.FloatVectorProperty(
+        name="Plane Color",
+        description="Color of the projection plane",
+        subtype='COLOR',
+        default=(0.25, 0.25, 0.25, 0.15),
+        min=0.0,
+        max=1.0,
+        size=4
+    )
+
+    plane_scale: bpy.props.FloatProperty(
+        name="Plane Scale",
+        description="Scale of the projection plane",
+        default=7,
+        min=0.0,
+        max=1000.0,
+    )
+
+    icon_scale: bpy.props.FloatProperty(
+        name="Icon Scale",
+        description="Scale of the '+' and '-' icons",
+        default=0.45,
+        min=0.0,
+        max=100.0,
+    )
+
+    icon_distance: bpy.props.FloatProperty(
+        name="Icon Distance",
+        description="Distance of the icons from the projection plane",
+        default=0.9,
+        min=0.0,
+        max=100.0
+    )
+
+    icon_alpha: bpy.props.FloatProperty(
+        name="Icon Alpha",
+        description="Transparency of the '+' and '-' icons",
+        default=0.9,
+        min=0.0,
+        max=1.0
+    )
+    
+    line_thickness: bpy.props.FloatProperty(
+        name="Icon Thickness",
+        description="Thickness of the vertex lines",
+        default=1.5,
+        min=0.1,
+        max=10.0
+    )
+
+    line_color: bpy.props.FloatVectorProperty(
+        name="Plane Color",
+        description="Color of the vertex lines",
+        subtype='COLOR',
+        default=(1, 0, 0, 1),
+        min=0.0,
+        max=1.0,
+        size=4
+    )
+
+    preview_line_budget: bpy.props.IntProperty(
+        name="Preview Line Budget",
+        description="Number of preview lines drawn before they are thinned out to one line per screen area",
+        default=20000,
+        min=100,
+        max=10000000
+    )
+
+    frame_time_budget: bpy.props.FloatProperty(
+        name="Frame Time Budget",
+        description="Time in milliseconds culling and drawing the preview lines may take per redraw, lines culled to the view are thinned out further while it is exceeded",
+        default=4.0,
+        min=0.1,
+        max=100.0
+    )
+
+    enable_profiling: bpy.props.BoolProperty(
+        name="Record Timings",
+        description="Record per-phase timings of the operators and the visual helpers",
+        default=False,
+        update=update_profiling
+    )
+
+    profile_allocations: bpy.props.BoolProperty(
+        name="Track Allocations",
+        description="Also record the peak memory allocated in every phase, this slows everything down",
+        default=False,
+        update=update_profiling
+    )
+
+    use_precompute: bpy.props.BoolProperty(
+        name="Precompute in Background",
+        description="Compute every side of the projection on background threads while the plane is edited, so the buttons only write the result. Keeps up to three projected copies of the selection in memory",
+        default=False,
+        update=update_precompute
+    )
+
+    blend: bpy.props.EnumProperty(
+        name="Shader Blend",
+        description="Alpha Blend Channels",
+        items=[
+            ('ALPHA_PREMULT', "ALPHA_PREMULT", "The original color channels are interpolated according to the alpha value with the new colors pre-multiplied by this value"),
+            ('ADDITIVE_PREMULT', "ADDITIVE_PREMULT ", "(Can give cool effect with black color, low alpha and big plane scale) The original color channels are added by the corresponding ones that are pre-multiplied by the alpha value"),
+            ('MULTIPLY', "MULTIPLY", "The original color channels are multiplied by the corresponding ones"),
+            ('SUBTRACT', "SUBTRACT", "The original color channels are subtracted by the corresponding ones"),
+            ('INVERT', "INVERT", "The original color channels are replaced by its complementary color"),
+        ],
+        default='ALPHA_PREMULT'
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        tool_props = context.preferences.addons[__name__].preferences
+        
+        box = layout.box()
+        row = box.row(align=True)
+        row.label(text="Plane Alpha Blend:")
+        row.prop(tool_props, "blend", text="")
+        row = box.row(align=True)
+        row.prop(tool_props, "plane_color", text="Plane Color")
+        row = box.row(align=True) 
+        row.label(text="Plane Scale")
+        row.prop(tool_props, "plane_scale", text="")
+        box = layout.box()
+        row = box.row(align=True)
+        row.label(text="Icon Scale")
+        row.prop(tool_props, "icon_scale", text="")
+        row = box.row(align=True)
+        row.label(text="Icon Thickness")
+        row.prop(tool_props, "icon_thickness", text="")
+        row = box.row(align=True)
+        row.label(text="Icon Distance")
+        row.prop(tool_props, "icon_distance", text="")
+        row = box.row(align=True)
+        row.label(text="Icon Alpha")
+        row.prop(tool_props, "icon_alpha", text="")
+        box = layout.box()
+        row = box.row(align=True)
+        row.label(text="Vertex Lines Thickness")
+        row.prop(tool_props, "line_thickness", text="")
+        row = box.row(align=True)
+        row.label(text="Vertex Lines Color")
+        row.prop(tool_props, "line_color", text="")
+        row = box.row(align=True)
+        row.label(text="Vertex Lines Budget")
+        row.prop(tool_props, "preview_line_budget", text="")
+        row = box.row(align=True)
+        row.label(text="Frame Time Budget (ms)")
+        row.prop(tool_props, "frame_time_budget", text="")
+
+
+class SetNormal(bpy.types.Operator):
+    """Set the plane normal to a specific axis"""
+    bl_idname = "wm.set_normal"
+    bl_label = "Set Normal"
+    #bl_options = {'REGISTER', 'UNDO'}
+
+    normal: bpy.props.EnumProperty(
+        name="Axis",
+        description="Axis to set the normal to",
+        items=[
+            ('X', "X", "Set the normal to the X-axis"),
+            ('Y', "Y", "Set the normal to the Y-axis"),
+            ('Z', "Z", "Set the normal to the Z-axis"),
+        ],
+        default='Z'
+    )
+
+    #@classmethod
+    #def poll(cls, context):
+    #    return context.active_object is not None and bpy.context.active_object.type == 'MESH'
+
+    def execute(self, context):
+        if self.normal == 'X':
+            bpy.context.scene.vertex_projection_props.plane_normal = (1, 0, 0)
+        elif self.normal == 'Y':
+            bpy.context.scene.vertex_projection_props.plane_normal = (0, 1, 0)
+        else:
+            bpy.context.scene.vertex_projection_props.plane_normal = (0, 0, 1)
+        for area in context.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+        return {'FINISHED'}
+
+
+def edit_mesh_objects(context):
+    """Objects in edit mode of the active object's type with the active object first, or just the active object outside edit mode"""
+    obj = context.active_object
+    if obj.mode != 'EDIT':
+        return [obj]
+    others = [o for o in context.objects_in_edit_mode if o.type == obj.type and o != obj]
+    return [obj] + others
+
+
+class SetNormalSel(bpy.types.Operator):
+    """Calculate normal matrix from selected vertices"""
+    bl_idname = "wm.set_normal_sel"
+    bl_label = "Set Normal from Selection"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    normal: bpy.props.EnumProperty(
+        name="Axis",
+        description="Axis to set the normal from selected vertices",
+        items=[
+            ('X', "Left", "Set the plane normal from selected vertices to the left"),
+            ('Y', "Front", "Set the plane normal from selected vertices to the front"),
+            ('Z', "Up", "Set the plane normal from selected vertices to the up"),
+        ],
+        default='Z'
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return bpy.context.active_object is not None and bpy.context.active_object.type == 'MESH'
+
+    def read_selected_co(self, obj):
+        """World space coordinates of the selected vertices of one object"""
+        if obj.mode == 'EDIT':
+            # Read the edit mesh arrays instead of syncing the mesh with a mode switch
+            mesh_data = snapshot.get_snapshot(obj, fresh=True)
+            return mesh_data.world_co(obj.matrix_world)[mesh_data.sel]
+        co, sel = read_mesh_verts(obj.data)
+        mat = np.array(obj.matrix_world, dtype=np.float64)
+        return co[sel] @ mat[:3, :3].T + mat[:3, 3]
+
+    def execute(self, context):
+        profiling.begin("Set Normal from Selection")
+        try:
+            return self.set_normal(context)
+        finally:
+            profiling.end()
+
+    def set_normal(self, context):
+        # The plane is built in world space so selections from every object in edit mode can be combined
+        with profiling.phase("read"):
+            selected_co = np.concatenate([self.read_selected_co(obj) for obj in edit_mesh_objects(context)])
+        profiling.count("vertices", len(selected_co))
+
+        if len(selected_co) < 2:
+            self.report({'WARNING'}, "Please select at least 2 vertices")
+            return {'CANCELLED'}
+
+        if bpy.context.scene.vertex_projection_props.use_best_fit and len(selected_co) > 2:
+            with profiling.phase("fit"):
+                fit = fit_plane(selected_co)
+            if fit is None:
+                self.report({'WARNING'}, "Selected vertices are colinear")
+                return {'CANCELLED'}
+            v, axes, rms, largest = fit
+            self.report({'INFO'}, (
+                f"Fitted plane to {len(selected_co)} vertices at ({v[0]:.4f}, {v[1]:.4f}, {v[2]:.4f}), "
+                f"RMS residual {rms:.6f}, largest {largest:.6f}"))
+            return self.apply_plane(context, v, axes)
+
+        with profiling.phase("fit"):
+            v1 = selected_co[0]
+            v2 = selected_co[1]
+
+            if len(selected_co) > 2:
+                v3 = selected_co[2]
+                v = (v1 + v2 + v3) / 3
+            else:
+                r3d = bpy.context.area.spaces.active.region_3d
+                v = (v1 + v2) / 2
+                v3 = view_third_point(v1, v2, r3d.view_matrix)
+
+            axes = plane_axes_from_points(v1, v2, v3)
+        if axes is None:
+            self.report({'WARNING'}, "Selected vertices are colinear")
+            return {'CANCELLED'}
+        return self.apply_plane(context, v, axes)
+
+    def apply_plane(self, context, v, axes):
+        if bpy.context.scene.vertex_projection_props.auto_set_cursor:
+            context.scene.cursor.location = v.tolist()
+
+        bpy.context.scene.vertex_projection_props.plane_normal = axes['XYZ'.index(self.normal)].tolist()
+        for area in context.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+        return {'FINISHED'}
+
+
+def write_projection(context, obj, bm, indices, projected, failed_verts, failed_edges=None, weld_distance=None):
+    """Write the projected vertices of one object and select or group the failed elements if enabled
+
+    With a weld distance the moved vertices that end up together are merged afterwards. Returns the
+    number of vertices the weld removed.
+    """
+    props = context.scene.vertex_projection_props
+    welded = 0
+    if not len(indices) and not (len(failed_verts) and (props.select_failed or props.group_failed)):
+        # Nothing changes, the edit mesh and its snapshot stay as they are
+        return welded
+    with profiling.phase("write"):
+        write_bmesh_verts(bm, indices, projected)
+        if len(failed_verts) and props.select_failed:
+            select_bmesh_elements(bm, failed_verts, failed_edges)
+        if len(failed_verts) and props.group_failed:
+            set_bmesh_vertex_group(obj, bm, "Projection Failed", failed_verts)
+    if weld_distance is not None:
+        with profiling.phase("weld"):
+            welded = weld_bmesh_verts(bm, indices, weld_distance)
+        profiling.count("welded", welded)
+    snapshot.invalidate(obj)
+    with profiling.phase("update"):
+        bmesh.update_edit_mesh(obj.data, loop_triangles=False)
+    return welded
+
+
+def shape_key_blocks(obj, props):
+    """Shape keys an object mode projection writes to, None to write the mesh itself"""
+    shape_keys = obj.data.shape_keys
+    if shape_keys is None:
+        return None
+    if props.shape_keys == 'ACTIVE':
+        return [obj.active_shape_key]
+    return [key_block for key_block in shape_keys.key_blocks
+            if props.shape_keys == 'ALL' or fnmatch.fnmatchcase(key_block.name, props.shape_key_filter)]
+
+
+def write_mesh_projection(context, obj, co, failed_verts, failed_edges=None):
+    """Object mode counterpart of write_projection, writes all coordinates of the mesh data with foreach_set
+
+    co is None when the projection was written to the shape keys already or nothing moved.
+    """
+    props = context.scene.vertex_projection_props
+    with profiling.phase("write"):
+        if co is None:
+            obj.data.update()
+        else:
+            write_mesh_verts(obj.data, co)
+        if len(failed_verts) and props.select_failed:
+            select_mesh_elements(obj.data, failed_verts, failed_edges)
+        if len(failed_verts) and props.group_failed:
+            set_mesh_vertex_group(obj, "Projection Failed", failed_verts)
+
+
+def report_failures(operator, failures):
+    """One summary of the elements that do not intersect the plane instead of a warning per element"""
+    if failures:
+        details = ", ".join(f"{count} {name}" for name, count in failures.items())
+        operator.report({'WARNING'}, f"{sum(failures.values())} elements do not intersect with this plane ({details})")
+
+
+class ExecuteProjection(bpy.types.Operator):
+    """Project vertices from the positive/negative side of the plane or closest vertices to it"""
+    bl_idname = "wm.execute_projection"
+    bl_label = "Project Vertices"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    is_positive: bpy.props.BoolProperty(
+        name="Positive Side",
+        description="Project vertices on the positive side of the plane",
+        default=True
+    )
+    
+    is_closest: bpy.props.BoolProperty(
+        name="Is Closest",
+        description="Project closest vertices to the plane",
+        default=False
+    )
+
+    vertex_group: bpy.props.StringProperty(
+        name="Vertex Group",
+        description="In object mode, project the vertices in this vertex group instead of the selection",
+        default=""
+    )
+
+    @classmethod
+    def poll(cls, context):
+        obj = bpy.context.active_object
+        return obj is not None and (obj.type == 'MESH' or obj.type in points.POINT_OBJECT_TYPES)
+
+    def execute(self, context):
+        objects = edit_mesh_objects(context)
+        # Leaving edit mode adds basis edits to the shape keys relative to it, so shape keys are
+        # always projected on the mesh data
+        toggle_mode = (context.scene.vertex_projection_props.shape_keys != 'ACTIVE' and objects[0].mode == 'EDIT'
+                       and objects[0].type == 'MESH' and any(obj.data.shape_keys for obj in objects))
+        if toggle_mode:
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        profiling.begin("Project")
+        failures = {}
+        self.welded = 0
+        self.streamed = 0
+        self.chunks = 0
+        self.moved = 0
+        self.skipped = 0
+        # Streamed objects and shape keys are written without comparing to the current coordinates
+        self.compared = False
+        try:
+            for obj in objects:
+                for name, count in self.project(context, obj).items():
+                    failures[name] = failures.get(name, 0) + count
+        finally:
+            profiling.end()
+            if toggle_mode:
+                bpy.ops.object.mode_set(mode='EDIT')
+
+        report_failures(self, failures)
+        if self.welded:
+            self.report({'INFO'}, f"Welded {self.welded} vertices")
+        if self.chunks:
+            precision = "float32" if context.scene.vertex_projection_props.precision == 'FLOAT32' else "float64"
+            self.report({'INFO'}, f"Streamed {self.streamed} elements in {self.chunks} chunks with {precision} buffers")
+        if self.compared:
+            self.report({'INFO'}, f"Moved {self.moved} vertices, skipped {self.skipped} already in place")
+        else:
+            self.report({'INFO'}, f"Moved {self.moved} vertices")
+
+        if self.is_closest:
+            self.is_closest = False
+        return {'FINISHED'}
+
+    def read_mesh(self, obj, edges):
+        """Object mode snapshot of the mesh data, with the selection replaced by the vertex group if one is set"""
+        mesh_data = snapshot.MeshSnapshot.from_mesh(obj.data, edges=edges)
+        if self.vertex_group:
+            sel = vertex_group_mask(obj, self.vertex_group)
+            if sel is None:
+                self.report({'WARNING'}, f"{obj.name} has no vertex group named {self.vertex_group}")
+                return None
+            mesh_data.sel = sel
+            if mesh_data.edges is not None:
+                mesh_data.edge_sel = sel[mesh_data.edges[:, 0]] & sel[mesh_data.edges[:, 1]]
+        return mesh_data
+
+    def project_points(self, context, obj):
+        """Project the selected points of a curve or Grease Pencil object
+
+        Points have no edges to slide along, so they are always projected like vertices.
+        """
+        props = context.scene.vertex_projection_props
+        with profiling.phase("read"):
+            blocks, co, sel = points.read_points(obj)
+        selection = np.flatnonzero(sel)
+        direction = props.vertex_normal if props.use_vertex_normal else None
+        with profiling.phase("math"):
+            indices, projected, failed, reasons = project_selection(
+                co, obj.matrix_world, context.scene.cursor.location, props.plane_normal, selection, direction=direction)
+        with profiling.phase("compare"):
+            indices, projected, skipped = moved_vertices(co, indices, projected, obj.matrix_world, props.skip_tolerance)
+        self.moved += len(indices)
+        self.skipped += skipped
+        self.compared = True
+        if len(indices):
+            with profiling.phase("write"):
+                co[indices] = projected
+                # Blocks without a moved point, such as unselected handles, are not written
+                points.write_points(obj, blocks, co, indices)
+        profiling.count("selected", len(selection))
+        profiling.count("moved", len(indices))
+        profiling.count("skipped", skipped)
+        profiling.count("failed", len(failed))
+        return count_failures(reasons)
+
+    def can_stream(self, props, obj):
+        """Streaming only covers the plain plane projection of the mesh data"""
+        if not props.use_streaming or obj.mode == 'EDIT' or props.use_mirror:
+            return False
+        if props.use_vertices_only and props.direction_mode != 'GLOBAL':
+            return False
+        if not props.use_vertices_only and props.edge_rule not in {'SEQUENTIAL', 'ORDER'}:
+            return False
+        return shape_key_blocks(obj, props) is None
+
+    def stream(self, context, obj):
+        """Object mode projection in chunks, the temporaries never grow with the selection
+
+        Only the coordinate and selection buffers are as big as the mesh, plus a copy of the
+        coordinates with the 'ORDER' edge rule and the int32 edge buffers in edge mode.
+        """
+        props = context.scene.vertex_projection_props
+        use_vertices_only = props.use_vertices_only
+        mesh = obj.data
+        with profiling.phase("read"):
+            co, sel = read_mesh_verts(mesh, dtype=np.float32 if props.precision == 'FLOAT32' else np.float64)
+            if self.vertex_group:
+                sel = vertex_group_mask(obj, self.vertex_group)
+                if sel is None:
+                    self.report({'WARNING'}, f"{obj.name} has no vertex group named {self.vertex_group}")
+                    return {}
+            edges = None
+            mask = sel
+            if not use_vertices_only:
+                # Vertex indices stay in the int32 foreach_get buffer
+                edges, mask = read_mesh_edges(mesh, dtype=np.int32)
+                if self.vertex_group:
+                    mask = sel[edges[:, 0]] & sel[edges[:, 1]]
+
+        direction = props.vertex_normal if use_vertices_only and props.use_vertex_normal else None
+        with profiling.phase("math"):
+            written, chunks, failed, reasons = project_mask_chunked(
+                co, np.array(obj.matrix_world), context.scene.cursor.location, props.plane_normal, mask,
+                props.chunk_size, edges=edges, direction=direction, is_positive=self.is_positive,
+                is_closest=self.is_closest, use_outside_edges=props.use_outside_edges, edge_rule=props.edge_rule)
+        profiling.count("moved", written)
+        profiling.count("chunks", chunks)
+        self.moved += written
+        profiling.count("failed", len(failed))
+        self.streamed += int(np.count_nonzero(mask))
+        self.chunks += chunks
+
+        failed_verts = failed if use_vertices_only else np.unique(edges[failed])
+        if co.dtype != np.float32:
+            # foreach_set takes float32, narrowing in place avoids another copy of the whole mesh
+            co = snapshot.narrow_to_float32(co)
+        write_mesh_projection(context, obj, co, failed_verts, None if use_vertices_only else failed)
+        return count_failures(reasons)
+
+    def project(self, context, obj):
+        """Project the selection of one object, with the plane moved into its object space
+
+        In edit mode this works on the edit mesh, in object mode directly on the mesh data without
+        building a BMesh, and on every shape key the shape key option picks. Returns the number of
+        elements that do not intersect the plane per failure reason.
+        """
+        if obj.type in points.POINT_OBJECT_TYPES:
+            return self.project_points(context, obj)
+        if self.can_stream(context.scene.vertex_projection_props, obj):
+            return self.stream(context, obj)
+
+        mat = obj.matrix_world
+        plane_no = bpy.context.scene.vertex_projection_props.plane_normal
+        plane_co = context.scene.cursor.location
+        use_vertices_only = context.scene.vertex_projection_props.use_vertices_only
+        plane_normal = plane_no
+        if use_vertices_only and context.scene.vertex_projection_props.use_vertex_normal:
+            plane_normal = context.scene.vertex_projection_props.vertex_normal
+        direction_mode = context.scene.vertex_projection_props.direction_mode if use_vertices_only else 'GLOBAL'
+        # Averaging normals over the selected neighbourhood needs the edges in vertex mode too
+        use_edges = not use_vertices_only or direction_mode == 'AVERAGE'
+
+        if obj.mode == 'EDIT':
+            bm = bmesh.from_edit_mesh(obj.data)
+            # A redo undoes the last projection first, which restores the arrays it was projected from
+            key = (tuple(v for row in mat for v in row), tuple(plane_co), tuple(plane_no), tuple(plane_normal), use_vertices_only)
+            with profiling.phase("read"):
+                originals = snapshot.get_originals(obj, key, bm)
+                if originals is not None:
+                    mesh_data = originals.snapshot
+                    selection = originals.selection
+                else:
+                    mesh_data = snapshot.get_snapshot(obj, bm, edges=use_edges, fresh=True)
+                    selection = np.flatnonzero(mesh_data.sel if use_vertices_only else mesh_data.edge_sel)
+                if use_edges:
+                    mesh_data.read_edges(bm)
+            profiling.count("redo", originals is not None)
+            snapshot.store_originals(obj, key, mesh_data, selection)
+            precomputed = None
+            if originals is None:
+                side = "closest" if self.is_closest else "positive" if self.is_positive else "negative"
+                precomputed = precompute.take(obj, context.scene.vertex_projection_props, plane_co, mesh_data, side)
+            profiling.count("precomputed", precomputed is not None)
+        else:
+            bm = None
+            precomputed = None
+            with profiling.phase("read"):
+                mesh_data = self.read_mesh(obj, use_edges)
+            if mesh_data is None:
+                return {}
+            selection = np.flatnonzero(mesh_data.sel if use_vertices_only else mesh_data.edge_sel)
+
+        passes = [(mat, selection)]
+        props = context.scene.vertex_projection_props
+        if props.use_mirror:
+            # Projecting through the mirrored object matrix puts the mirrored plane into object space
+            with profiling.phase("mirror"):
+                if use_vertices_only:
+                    mirrored = symmetry.mirror_selection(
+                        mesh_data.co, mesh_data.sel, selection, props.mirror_axis, props.mirror_tolerance)
+                else:
+                    mirrored = symmetry.mirror_selection(
+                        mesh_data.co, mesh_data.sel, selection, props.mirror_axis, props.mirror_tolerance,
+                        edges=mesh_data.edges, edge_sel=mesh_data.edge_sel)
+            profiling.count("mirrored", len(mirrored))
+            passes.append((np.array(mat) @ symmetry.mirror_matrix(props.mirror_axis), mirrored))
+
+        def solve(co, normals_of=None):
+            """Project co through every pass, normals_of returns the normals of the given vertices"""
+            results = []
+            with profiling.phase("math"):
+                for pass_mat, pass_selection in passes:
+                    if use_vertices_only and direction_mode != 'GLOBAL':
+                        normals = normals_of(pass_selection)
+                        if direction_mode == 'AVERAGE':
+                            normals = average_normals(normals, pass_selection, mesh_data.edges, len(co))
+                        results.append(project_along_normals(co, pass_mat, plane_co, plane_no, pass_selection, normals))
+                    elif use_vertices_only:
+                        results.append(project_selection(
+                            co, pass_mat, plane_co, plane_no, pass_selection, direction=plane_normal))
+                    else:
+                        results.append(project_selection(
+                            co, pass_mat, plane_co, plane_no, pass_selection, edges=mesh_data.edges,
+                            is_positive=self.is_positive, is_closest=self.is_closest,
+                            use_outside_edges=props.use_outside_edges, edge_rule=props.edge_rule))
+            return [np.concatenate(arrays) for arrays in zip(*results)]
+
+        key_blocks = shape_key_blocks(obj, props) if bm is None else None
+        if key_blocks is not None and not key_blocks:
+            self.report({'WARNING'}, f"{obj.name} has no shape keys matching {props.shape_key_filter}")
+            return {}
+        if key_blocks:
+            # Every shape key is projected from its own coordinates with the same selection
+            failed_keys = []
+            reasons = []
+            for key_block in key_blocks:
+                with profiling.phase("read"):
+                    co = read_shape_key(key_block)
+                    if direction_mode != 'GLOBAL':
+                        key_normals = np.array(key_block.normals_vertex_get()).reshape(-1, 3)
+                indices, projected, failed, key_reasons = solve(co, lambda indices: key_normals[indices])
+                with profiling.phase("write"):
+                    co[indices] = projected
+                    write_shape_key(key_block, co)
+                    if key_block == obj.data.shape_keys.reference_key:
+                        write_mesh_verts(obj.data, co)
+                failed_keys.append(failed)
+                reasons.append(key_reasons)
+                self.moved += len(indices)
+                profiling.count("moved", len(indices))
+            profiling.count("shape keys", len(key_blocks))
+            # An element failing on several shape keys is reported once, with the reason of the first key
+            failed, first = np.unique(np.concatenate(failed_keys), return_index=True)
+            reasons = np.concatenate(reasons)[first]
+            co = None
+        else:
+            if direction_mode == 'GLOBAL':
+                normals_of = None
+            elif bm is None:
+                mesh_normals = read_mesh_normals(obj.data)
+                normals_of = lambda indices: mesh_normals[indices]
+            else:
+                # Edit mesh normals are only refreshed on demand, and only needed here
+                with profiling.phase("normals"):
+                    bm.normal_update()
+                normals_of = lambda indices: read_bmesh_normals(bm, indices)
+            if precomputed is not None:
+                indices, projected, failed, reasons = precomputed
+            else:
+                indices, projected, failed, reasons = solve(mesh_data.co, normals_of)
+            # Elements already on the plane from an earlier run are not written again
+            with profiling.phase("compare"):
+                indices, projected, skipped = moved_vertices(mesh_data.co, indices, projected, mat, props.skip_tolerance)
+            self.moved += len(indices)
+            self.skipped += skipped
+            self.compared = True
+            profiling.count("moved", len(indices))
+            profiling.count("skipped", skipped)
+            co = None
+            if bm is None and len(indices):
+                co = mesh_data.co.copy()
+                co[indices] = projected
+        failed_verts = failed if use_vertices_only else np.unique(mesh_data.edges[failed])
+
+        profiling.count("selected", len(selection))
+        profiling.count("failed", len(failed))
+        if bm is None:
+            write_mesh_projection(context, obj, co, failed_verts, None if use_vertices_only else failed)
+        else:
+            self.welded += write_projection(
+                context, obj, bm, indices, projected, failed_verts, None if use_vertices_only else failed,
+                weld_distance=props.weld_distance if props.use_weld else None)
+        return count_failures(reasons)
+
+
+class ProjectPlaneStack(bpy.types.Operator):
+    """Project the selection against every plane in the stack in one pass"""
+    bl_idname = "wm.project_plane_stack"
+    bl_label = "Project Plane Stack"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    use_nearest: bpy.props.BoolProperty(
+        name="Nearest Plane",
+        description="Project every element onto the violated plane it is closest to instead of the first one",
+        default=False
+    )
+
+    @classmethod
+    def poll(cls, context):
+        obj = bpy.context.active_object
+        # The stack is projected on the edit mesh only
+        return (obj is not None and obj.type == 'MESH' and obj.mode == 'EDIT'
+                and len(context.scene.vertex_projection_props.planes) > 0)
+
+    def execute(self, context):
+        profiling.begin("Project Plane Stack")
+        failures = {}
+        try:
+            for obj in edit_mesh_objects(context):
+                for name, count in self.project(context, obj).items():
+                    failures[name] = failures.get(name, 0) + count
+        finally:
+            profiling.end()
+
+        report_failures(self, failures)
+        return {'FINISHED'}
+
+    def project(self, context, obj):
+        """Project the selection of one object in edit mode, returns the failures per reason"""
+        props = context.scene.vertex_projection_props
+        bm = bmesh.from_edit_mesh(obj.data)
+        use_vertices_only = props.use_vertices_only
+        with profiling.phase("read"):
+            mesh_data = snapshot.get_snapshot(obj, bm, edges=not use_vertices_only, fresh=True)
+        plane_cos = [plane.origin for plane in props.planes]
+        plane_nos = [plane.normal for plane in props.planes]
+        sides = [1 if plane.side == 'POSITIVE' else -1 for plane in props.planes]
+
+        if use_vertices_only:
+            selection = np.flatnonzero(mesh_data.sel)
+            with profiling.phase("math"):
+                indices, projected, failed, reasons = project_selection_on_planes(
+                    mesh_data.co, obj.matrix_world, plane_cos, plane_nos, sides, selection, use_nearest=self.use_nearest)
+            failed_verts = failed
+        else:
+            selection = np.flatnonzero(mesh_data.edge_sel)
+            with profiling.phase("math"):
+                indices, projected, failed, reasons = project_selection_on_planes(
+                    mesh_data.co, obj.matrix_world, plane_cos, plane_nos, sides, selection, edges=mesh_data.edges,
+                    use_nearest=self.use_nearest, use_outside_edges=props.use_outside_edges)
+            failed_verts = np.unique(mesh_data.edges[failed])
+
+        profiling.count("selected", len(selection))
+        profiling.count("planes", len(sides))
+        profiling.count("moved", len(indices))
+        profiling.count("failed", len(failed))
+        write_projection(context, obj, bm, indices, projected, failed_verts, None if use_vertices_only else failed)
+        return count_failures(reasons)
+
+
+class AddStackPlane(bpy.types.Operator):
+    """Add the current cursor plane to the plane stack"""
+    bl_idname = "wm.add_stack_plane"
+    bl_label = "Add Plane"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        props = context.scene.vertex_projection_props
+        plane = props.planes.add()
+        plane.name = f"Plane {len(props.planes)}"
+        plane.origin = context.scene.cursor.location
+        plane.normal = props.plane_normal
+        props.active_plane_index = len(props.planes) - 1
+        return {'FINISHED'}
+
+
+class RemoveStackPlane(bpy.types.Operator):
+    """Remove the active plane from the plane stack"""
+    bl_idname = "wm.remove_stack_plane"
+    bl_label = "Remove Plane"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        props = context.scene.vertex_projection_props
+        return 0 <= props.active_plane_index < len(props.planes)
+
+    def execute(self, context):
+        props = context.scene.vertex_projection_props
+        props.planes.remove(props.active_plane_index)
+        props.active_plane_index = min(props.active_plane_index, len(props.planes) - 1)
+        update_preview(self, context)
+        return {'FINISHED'}
+
+
+class ProjectOnSurface(bpy.types.Operator):
+    """Project the selected vertices onto the surface of the target object"""
+    bl_idname = "wm.project_on_surface"
+    bl_label = "Project on Surface"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        obj = bpy.context.active_object
+        target = context.scene.vertex_projection_props.target_object
+        return obj is not None and obj.type == 'MESH' and obj.mode == 'EDIT' and target is not None and target != obj
+
+    def execute(self, context):
+        target = context.scene.vertex_projection_props.target_object
+        profiling.begin("Project on Surface")
+        failures = {}
+        try:
+            with profiling.phase("tree"):
+                tree = surface.get_tree(target, context.evaluated_depsgraph_get())
+            profiling.count("triangles", tree.triangle_count)
+            for obj in edit_mesh_objects(context):
+                if obj == target:
+                    continue
+                for name, count in self.project(context, obj, tree).items():
+                    failures[name] = failures.get(name, 0) + count
+        finally:
+            profiling.end()
+
+        report_failures(self, failures)
+        return {'FINISHED'}
+
+    def project(self, context, obj, tree):
+        """Project the selection of one object in edit mode, returns the number of vertices that miss the surface"""
+        props = context.scene.vertex_projection_props
+        mesh = obj.data
+        bm = bmesh.from_edit_mesh(mesh)
+        mat = np.array(obj.matrix_world, dtype=np.float64)
+        with profiling.phase("read"):
+            mesh_data = snapshot.get_snapshot(obj, bm, fresh=True)
+            selection = np.flatnonzero(mesh_data.sel)
+            world_co = mesh_data.world_co(obj.matrix_world)[selection]
+            if props.surface_direction == 'OWN':
+                # Edit mesh normals are only refreshed on demand
+                bm.normal_update()
+                # Normals move to world space with the inverse transpose, as rows that is n @ inverse
+                direction = read_bmesh_normals(bm, selection) @ np.linalg.inv(mat[:3, :3])
+            elif props.surface_direction == 'VERTEX_NORMAL':
+                direction = np.array(props.vertex_normal)
+            else:
+                direction = np.array(props.plane_normal)
+
+        with profiling.phase("math"):
+            projected, hit = surface.project_on_surface(tree, world_co, direction, props.use_nearest_fallback)
+            local_co = np.linalg.solve(mat[:3, :3], (projected[hit] - mat[:3, 3]).T).T
+        failed = selection[~hit]
+
+        profiling.count("selected", len(selection))
+        profiling.count("moved", len(local_co))
+        profiling.count("failed", len(failed))
+        write_projection(context, obj, bm, selection[hit], local_co, failed)
+        return count_failures(np.full(len(failed), MISSED, dtype=np.uint8))
+
+
+class ModalTarget:
+    """Original arrays and the vertices an interactive projection may move in one object"""
+
+    def __init__(self, obj, bm, mesh_data, selection, candidates):
+        self.obj = obj
+        self.mesh_data = mesh_data
+        self.selection = selection
+        # Sorted indices of every vertex a projection of the selection can move
+        self.candidates = candidates
+        bm.verts.ensure_lookup_table()
+        self.verts = [bm.verts[index] for index in candidates.tolist()]
+        self.current = mesh_data.co[candidates]
+
+    def write(self, co):
+        """Write the candidate coordinates, skipping the vertices that did not change since the last write"""
+        changed = np.flatnonzero(np.any(co != self.current, axis=1))
+        verts = self.verts
+        for index, vert_co in zip(changed.tolist(), co[changed].tolist()):
+            verts[index].co = vert_co
+        self.current = co
+        bmesh.update_edit_mesh(self.obj.data, loop_triangles=False, destructive=False)
+
+    def restore(self):
+        self.write(self.mesh_data.co[self.candidates])
+
+
+class InteractiveProjection(bpy.types.Operator):
+    """Move the plane along its normal or rotate it with the mouse and see the projection live"""
+    bl_idname = "wm.interactive_projection"
+    bl_label = "Interactive Projection"
+    bl_options = {'REGISTER', 'UNDO', 'BLOCKING', 'GRAB_CURSOR'}
+
+    is_positive: bpy.props.BoolProperty(
+        name="Positive Side",
+        description="Project vertices on the positive side of the plane",
+        default=True
+    )
+
+    is_closest: bpy.props.BoolProperty(
+        name="Is Closest",
+        description="Project closest vertices to the plane",
+        default=False
+    )
+
+    offset: bpy.props.FloatProperty(
+        name="Offset",
+        description="Distance the plane is moved along its normal from the cursor",
+        default=0.0,
+        subtype='DISTANCE'
+    )
+
+    angle: bpy.props.FloatProperty(
+        name="Angle",
+        description="Rotation of the plane normal around the view axis",
+        default=0.0,
+        subtype='ANGLE'
+    )
+
+    axis: bpy.props.FloatVectorProperty(
+        name="Axis",
+        description="View axis the plane normal is rotated around",
+        default=(0.0, 0.0, 1.0),
+        subtype='XYZ',
+        options={'HIDDEN'}
+    )
+
+    @classmethod
+    def poll(cls, context):
+        obj = bpy.context.active_object
+        return obj is not None and obj.type == 'MESH' and obj.mode == 'EDIT' and context.area is not None and context.area.type == 'VIEW_3D'
+
+    def plane(self, context):
+        """World space plane and vertex projection direction for the current offset and angle"""
+        props = context.scene.vertex_projection_props
+        plane_no = Matrix.Rotation(self.angle, 3, Vector(self.axis)) @ props.plane_normal
+        plane_co = context.scene.cursor.location + plane_no.normalized() * self.offset
+        direction = props.vertex_normal if props.use_vertex_normal else plane_no
+        return plane_co, plane_no, direction
+
+    def read_targets(self, context):
+        use_vertices_only = context.scene.vertex_projection_props.use_vertices_only
+        self.targets = []
+        for obj in edit_mesh_objects(context):
+            bm = bmesh.from_edit_mesh(obj.data)
+            mesh_data = snapshot.get_snapshot(obj, bm, edges=not use_vertices_only, fresh=True)
+            if use_vertices_only:
+                selection = np.flatnonzero(mesh_data.sel)
+                candidates = selection
+            else:
+                selection = np.flatnonzero(mesh_data.edge_sel)
+                candidates = np.unique(mesh_data.edges[selection])
+            if len(selection):
+                self.targets.append(ModalTarget(obj, bm, mesh_data, selection, candidates))
+
+    def apply(self, context):
+        """Project every target from its original coordinates, returns the failures per reason"""
+        props = context.scene.vertex_projection_props
+        plane_co, plane_no, direction = self.plane(context)
+        failures = {}
+        for target in self.targets:
+            mesh_data = target.mesh_data
+            if props.use_vertices_only:
+                indices, projected, failed, reasons = project_selection(
+                    mesh_data.co, target.obj.matrix_world, plane_co, plane_no, target.selection, direction=direction)
+            else:
+                indices, projected, failed, reasons = project_selection(
+                    mesh_data.co, target.obj.matrix_world, plane_co, plane_no, target.selection, edges=mesh_data.edges,
+                    is_positive=self.is_positive, is_closest=self.is_closest, use_outside_edges=props.use_outside_edges,
+                    edge_rule=props.edge_rule)
+                # A vertex shared by several edges keeps the result of the last one, like the bmesh write
+                _, last = np.unique(indices[::-1], return_index=True)
+                keep = len(indices) - 1 - last
+                indices, projected = indices[keep], projected[keep]
+
+            co = mesh_data.co[target.candidates]
+            co[np.searchsorted(target.candidates, indices)] = projected
+            target.write(co)
+            for name, count in count_failures(reasons).items():
+                failures[name] = failures.get(name, 0) + count
+        return failures
+
+    def mouse(self, event):
+        """Mouse position in the 3D view region, the operator is usually started from the sidebar"""
+        return Vector((event.mouse_x - self.region.x, event.mouse_y - self.region.y))
+
+    def start_drag(self, context, event):
+        """Take the current mouse position and plane as the start of a move or rotation"""
+        region = self.region
+        region_data = self.region_data
+        self.start_mouse = self.mouse(event)
+        self.start_offset = self.offset
+        self.start_angle = self.angle
+
+        plane_co, plane_no, _ = self.plane(context)
+        self.center = location_3d_to_region_2d(region, region_data, plane_co)
+        tip = location_3d_to_region_2d(region, region_data, plane_co + plane_no.normalized())
+        if self.center is not None and tip is not None and (tip - self.center).length > 1:
+            # Screen space length of one unit along the normal, dragging follows the normal on screen
+            self.screen_normal = tip - self.center
+        else:
+            # The normal points at the viewer, drag up and down instead
+            self.screen_normal = Vector((0.0, region.height / region_data.view_distance))
+        if self.center is None:
+            self.center = Vector((region.width / 2, region.height / 2))
+
+    def drag(self, event):
+        mouse = self.mouse(event)
+        if self.mode == 'OFFSET':
+            delta = mouse - self.start_mouse
+            self.offset = self.start_offset + delta.dot(self.screen_normal) / self.screen_normal.length_squared
+        else:
+            start = self.start_mouse - self.center
+            current = mouse - self.center
+            self.angle = self.start_angle + math.atan2(current.y, current.x) - math.atan2(start.y, start.x)
+
+    def update_header(self, context):
+        context.area.header_text_set(
+            f"Offset: {self.offset:.4f}  Angle: {math.degrees(self.angle):.2f}°  "
+            "(G: move, R: rotate, LMB/Enter: confirm, RMB/Esc: cancel)")
+
+    def invoke(self, context, event):
+        self.read_targets(context)
+        if not self.targets:
+            self.report({'WARNING'}, "Nothing selected to project")
+            return {'CANCELLED'}
+
+        self.region = next(region for region in context.area.regions if region.type == 'WINDOW')
+        self.region_data = context.area.spaces.active.region_3d
+        self.offset = 0.0
+        self.angle = 0.0
+        self.axis = self.region_data.view_rotation @ Vector((0.0, 0.0, 1.0))
+        self.mode = 'OFFSET'
+        self.failures = {}
+        self.start_drag(context, event)
+        self.update_header(context)
+        context.window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'MOUSEMOVE':
+            self.drag(event)
+            self.failures = self.apply(context)
+            self.update_header(context)
+        elif event.type in {'G', 'R'} and event.value == 'PRESS':
+            self.mode = 'OFFSET' if event.type == 'G' else 'ROTATE'
+            self.start_drag(context, event)
+        elif event.type in {'LEFTMOUSE', 'RET', 'NUMPAD_ENTER'} and event.value == 'PRESS':
+            context.area.header_text_set(None)
+            self.finish()
+            return {'FINISHED'}
+        elif event.type in {'RIGHTMOUSE', 'ESC'} and event.value == 'PRESS':
+            context.area.header_text_set(None)
+            for target in self.targets:
+                target.restore()
+                snapshot.invalidate(target.obj)
+            return {'CANCELLED'}
+        return {'RUNNING_MODAL'}
+
+    def finish(self):
+        report_failures(self, self.failures)
+        for target in self.targets:
+            snapshot.invalidate(target.obj)
+
+    def execute(self, context):
+        # Redo runs the projection once with the offset and angle from the redo panel
+        self.read_targets(context)
+        self.failures = self.apply(context)
+        self.finish()
+        return {'FINISHED'}
+
+
+class ExportProfile(bpy.types.Operator):
+    """Write the recorded timings to a JSON or CSV file"""
+    bl_idname = "wm.export_projection_profile"
+    bl_label = "Export Timings"
+
+    filepath: StringProperty(subtype='FILE_PATH')
+
+    file_format: EnumProperty(
+        name="Format",
+        items=[
+            ('JSON', "JSON", "One object per recorded call with all its phases"),
+            ('CSV', "CSV", "One row per phase of every recorded call"),
+        ],
+        default='JSON'
+    )
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "vertex_project_timings." + self.file_format.lower()
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        if self.file_format == 'CSV':
+            profiling.dump_csv(self.filepath)
+        else:
+            profiling.dump_json(self.filepath)
+        self.report({'INFO'}, f"Wrote {len(profiling.all_records())} records to {self.filepath}")
+        return {'FINISHED'}
+
+
+class ClearProfile(bpy.types.Operator):
+    """Clear the recorded timings"""
+    bl_idname = "wm.clear_projection_profile"
+    bl_label = "Clear Timings"
+
+    def execute(self, context):
+        profiling.clear()
+        return {'FINISHED'}
+
+
+class ShowDebugHelper(bpy.types.Operator):
+    """Show or hide visual helpers for the projection plane and icons"""
+    bl_idname = "wm.show_debug"
+    bl_label = "Show Debug"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        obj = bpy.context.active_object
+        return obj is not None and (obj.type == 'MESH' or obj.type in points.POINT_OBJECT_TYPES)
+
+    def execute(self, context):
+        global draw_handler_handle, rect_batch, plus_batch, minus_batch, lines_batch, view_batch, lines_pos, rect_key, lines_key, view_key, stack_batch, stack_key
+        for area in context.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+        if draw_handler_handle is None:
+            args = (self, context)
+            draw_handler_handle = bpy.types.SpaceView3D.draw_handler_add(draw, args, 'WINDOW', 'POST_VIEW')        
+            return {'FINISHED'}
+        else:
+            bpy.types.SpaceView3D.draw_handler_remove(draw_handler_handle, 'WINDOW')
+            draw_handler_handle = None
+            rect_batch = None
+            plus_batch = None
+            minus_batch = None
+            lines_batch = None
+            view_batch = None
+            lines_pos = None
+            rect_key = None
+            lines_key = None
+            view_key = None
+            stack_batch = None
+            stack_key = None
+            return {'FINISHED'}
+
+
+draw_handler_handle = None
+rect_batch = None
+plus_batch = None
+minus_batch = None
+lines_batch = None
+view_batch = None
+lines_pos = None
+stack_batch = None
+# Inputs the cached rectangle and preview lines were built from, None forces a rebuild
+rect_key = None
+lines_key = None
+view_key = None
+stack_key = None
+# Fraction of the lines looked at and kept when they are culled to a new view, lowered while
+# culling and drawing them takes longer than the frame time budget
+lod_scale = 1.0
+# Seconds the last get_lines_batch call spent culling the lines to a new view, None if it did not
+view_time = None
+
+
+def get_geometry_batches(self, context):
+    global rect_batch, plus_batch, minus_batch, rect_key
+    rect_size = context.preferences.addons[__name__].preferences.plane_scale
+    icon_size = context.preferences.addons[__name__].preferences.icon_scale
+    
+    obj = bpy.context.active_object
+    if obj and (obj.type == 'MESH' or obj.type in points.POINT_OBJECT_TYPES):
+        cursor_loc = bpy.context.scene.cursor.location
+        cursor_normal = bpy.context.scene.vertex_projection_props.plane_normal
+        shader = gpu.shader.from_builtin('UNIFORM_COLOR')
+
+        # The plane only changes with the cursor, the normal or its scale
+        key = (tuple(cursor_loc), tuple(cursor_normal), rect_size)
+        if rect_batch is None or key != rect_key:
+            with profiling.phase("plane"):
+                # Define the vertices for the rectangle
+                local_rect_verts = [
+                    mathutils.Vector((-rect_size, rect_size, 0)),
+                    mathutils.Vector((-rect_size, -rect_size, 0)),
+                    mathutils.Vector((rect_size, -rect_size, 0)),
+                    mathutils.Vector((rect_size, rect_size, 0))
+                ]
+
+                # Rotate the vertices by the cursor normal
+                rotation_matrix = cursor_normal.to_track_quat('Z', 'Y').to_matrix().to_4x4()
+                rect_verts = [cursor_loc + rotation_matrix @ vert for vert in local_rect_verts]
+
+                rect_indices = ((0, 1, 2), (2, 3, 0))
+                rect_batch = batch_for_shader(shader, 'TRIS', {"pos": rect_verts}, indices=rect_indices)
+                rect_key = key
+
+        with profiling.phase("icons"):
+            # Define the vertices for the "+" icon
+            local_plus_verts = [
+                mathutils.Vector((icon_size, 0, 0)),
+                mathutils.Vector((-icon_size, 0, 0)),
+                mathutils.Vector((0, icon_size, 0)),
+                mathutils.Vector((0, -icon_size, 0))
+            ]
+
+            # Define the vertices for the "-" icon
+            local_minus_verts = [
+                mathutils.Vector((icon_size, 0, 0)),
+                mathutils.Vector((-icon_size, 0, 0))
+            ]
+
+            # Calculate the view matrix and its inverse
+            view_matrix = context.region_data.view_matrix.copy()
+            view_matrix.translation = mathutils.Vector((0, 0, 0))
+            inv_view_matrix = view_matrix.inverted()
+
+            # Apply the inverse view matrix to the icons' vertices
+            plus_verts = [(cursor_loc + cursor_normal * (icon_size + context.preferences.addons[__name__].preferences.icon_distance) + inv_view_matrix @ vert) for vert in local_plus_verts]
+            minus_verts = [(cursor_loc - cursor_normal * (icon_size + context.preferences.addons[__name__].preferences.icon_distance) + inv_view_matrix @ vert) for vert in local_minus_verts]
+
+            plus_indices = ((0, 1), (2, 3))
+            plus_batch = batch_for_shader(shader, 'LINES', {"pos": plus_verts}, indices=plus_indices)
+
+            minus_indices = ((0, 1),)
+            minus_batch = batch_for_shader(shader, 'LINES', {"pos": minus_verts}, indices=minus_indices)
+
+    return rect_batch, plus_batch, minus_batch
+
+
+def get_stack_batch(context, shader):
+    """TRIS batch with a rectangle for every plane in the stack, rebuilt only when the stack changes"""
+    global stack_batch, stack_key
+    planes = context.scene.vertex_projection_props.planes
+    rect_size = context.preferences.addons[__name__].preferences.plane_scale
+    key = (tuple((tuple(plane.origin), tuple(plane.normal)) for plane in planes), rect_size)
+    if key != stack_key:
+        stack_batch = None
+        stack_key = key
+        if len(planes):
+            with profiling.phase("stack"):
+                local_rect_verts = [
+                    mathutils.Vector((-rect_size, rect_size, 0)),
+                    mathutils.Vector((-rect_size, -rect_size, 0)),
+                    mathutils.Vector((rect_size, -rect_size, 0)),
+                    mathutils.Vector((rect_size, rect_size, 0))
+                ]
+                rect_verts = []
+                rect_indices = []
+                for plane in planes:
+                    rotation_matrix = mathutils.Vector(plane.normal).to_track_quat('Z', 'Y').to_matrix()
+                    start = len(rect_verts)
+                    rect_verts += [mathutils.Vector(plane.origin) + rotation_matrix @ vert for vert in local_rect_verts]
+                    rect_indices += [(start, start + 1, start + 2), (start + 2, start + 3, start)]
+                stack_batch = batch_for_shader(shader, 'TRIS', {"pos": rect_verts}, indices=rect_indices)
+    return stack_batch
+
+
+def get_lines_batch(context, objects, shader):
+    """LINES batch from the selected vertices of all objects to their projections
+
+    The world space lines are rebuilt only when their inputs change. Within the line budget they
+    are drawn from one cached batch, above it they are culled to the view and thinned out to one
+    line per screen area, which is redone only when the view changes. Culling walks every line, so
+    the level of detail also bounds how many of them are looked at.
+    """
+    global lines_batch, view_batch, lines_pos, lines_key, view_key, view_time
+    view_time = None
+    props = context.scene.vertex_projection_props
+    plane_co = context.scene.cursor.location
+    plane_no = props.plane_normal
+    plane_normal = props.vertex_normal if props.use_vertex_normal else plane_no
+
+    object_keys = tuple((obj.name_full, tuple(v for row in obj.matrix_world for v in row)) for obj in objects)
+    key = (object_keys, tuple(plane_co), tuple(plane_no), tuple(plane_normal))
+    if lines_pos is None or key != lines_key:
+        with profiling.phase("read"):
+            world_co = []
+            for obj in objects:
+                if obj.type == 'MESH':
+                    mesh_data = snapshot.get_snapshot(obj)
+                    world_co.append(mesh_data.world_co(obj.matrix_world)[mesh_data.sel])
+                else:
+                    _, co, sel = points.read_points(obj)
+                    mat = np.array(obj.matrix_world, dtype=np.float64)
+                    world_co.append(co[sel] @ mat[:3, :3].T + mat[:3, 3])
+            world_co = np.concatenate(world_co)
+        with profiling.phase("math"):
+            projected, hit = project_points_on_plane(world_co, np.array(plane_normal) * 2, np.array(plane_co), np.array(plane_no))
+
+            # Interleave start and end points, one line per vertex that hits the plane
+            lines_pos = np.empty((np.count_nonzero(hit) * 2, 3), dtype=np.float32)
+            lines_pos[0::2] = world_co[hit]
+            lines_pos[1::2] = projected[hit]
+        lines_key = key
+        lines_batch = None
+        view_key = None
+
+    budget = context.preferences.addons[__name__].preferences.preview_line_budget
+    profiling.count("lines", len(lines_pos) // 2)
+    if len(lines_pos) // 2 <= budget:
+        if lines_batch is None:
+            with profiling.phase("batch"):
+                lines_batch = batch_for_shader(shader, 'LINES', {"pos": lines_pos})
+        return lines_batch
+
+    region = context.region
+    perspective_matrix = context.region_data.perspective_matrix
+    # The level of detail is applied whenever the view changes anyway, it never forces a rebuild itself
+    view = (tuple(v for row in perspective_matrix for v in row), region.width, region.height, budget)
+    if view_batch is None or view != view_key:
+        start = time.perf_counter()
+        budget = max(int(budget * lod_scale), 1)
+        with profiling.phase("cull"):
+            # Every stride-th line, the same ones for every view so the subset does not flicker
+            stride = max(int(1 / lod_scale), 1)
+            pos = lines_pos if stride == 1 else line_positions(lines_pos, np.arange(0, len(lines_pos) // 2, stride))
+            visible = np.flatnonzero(visible_lines(pos, perspective_matrix))
+            if len(visible) > budget:
+                visible = visible[decimate_lines(line_positions(pos, visible), perspective_matrix, (region.width, region.height), budget)]
+        with profiling.phase("batch"):
+            view_batch = batch_for_shader(shader, 'LINES', {"pos": line_positions(pos, visible)})
+        view_key = view
+        view_time = time.perf_counter() - start
+    return view_batch
+
+
+def update_lod(context, elapsed, rebuilt):
+    """Thin out the culled preview lines while culling and drawing them takes longer than the frame time budget
+
+    Frames that only draw the cached lines can lower the level of detail but not raise it, they
+    say nothing about the cost of the next view change.
+    """
+    global lod_scale
+    frame_time_budget = context.preferences.addons[__name__].preferences.frame_time_budget / 1000
+    if elapsed > frame_time_budget:
+        lod_scale = max(lod_scale * 0.5, 1 / 1024)
+    elif rebuilt and elapsed < frame_time_budget * 0.5:
+        lod_scale = min(lod_scale * 1.25, 1.0)
+
+
+@persistent
+def update_mesh_data(scene, depsgraph):
+    """Drop cached mesh arrays and preview lines when a mesh or object was edited"""
+    global lines_key
+    surface.update_from_depsgraph(depsgraph)
+    if snapshot.update_from_depsgraph(depsgraph):
+        lines_key = None
+
+
+@persistent
+def clear_mesh_data(*args):
+    """Redo and file loads swap the edit mesh without a depsgraph update first"""
+    global lines_key
+    snapshot.invalidate()
+    snapshot.originals.clear()
+    surface.invalidate()
+    lines_key = None
+
+
+@persistent
+def undo_mesh_data(*args):
+    """Undo swaps the edit mesh as well, possibly back to the originals of the last projection"""
+    global lines_key
+    snapshot.invalidate()
+    snapshot.undo_originals()
+    lines_key = None
+
+
+# Owner of the cursor subscription, message bus subscriptions are cleared when a file is loaded
+cursor_owner = object()
+
+
+@persistent
+def subscribe_cursor(*args):
+    bpy.msgbus.clear_by_owner(cursor_owner)
+    bpy.msgbus.subscribe_rna(
+        key=(bpy.types.View3DCursor, "location"),
+        owner=cursor_owner,
+        args=(None, None),
+        notify=update_preview,
+    )
+
+
+def update_mode(self, context):
+    if context.active_object and context.active_object.type == 'MESH' and context.active_object.mode == 'EDIT':
+        draw(self, context)
+
+# Draw handler function
+def draw(self, context):
+    global rect_batch, plus_batch, minus_batch
+    obj = context.active_object
+    if obj and (obj.type == 'MESH' and obj.mode == 'EDIT' or obj.type in points.POINT_OBJECT_TYPES and obj.mode in points.EDIT_MODES):
+        profiling.begin("Draw Helpers", is_draw=True)
+        rect_batch, plus_batch, minus_batch = get_geometry_batches(self, context)
+
+        shader = gpu.shader.from_builtin('UNIFORM_COLOR')
+        
+        shader.uniform_float("color", (context.preferences.addons[__name__].preferences.line_color))
+        gpu.state.line_width_set(context.preferences.addons[__name__].preferences.line_thickness)
+        # Curve and Grease Pencil points are always projected like vertices
+        if bpy.context.scene.vertex_projection_props.use_vertices_only or obj.type != 'MESH':
+            batch = get_lines_batch(context, edit_mesh_objects(context), shader)
+            # Culling to a new view is timed with the draw call, reading the mesh does not depend on the level of detail
+            start = time.perf_counter()
+            with profiling.phase("draw"):
+                batch.draw(shader)
+            rebuilt = view_time is not None
+            update_lod(context, time.perf_counter() - start + (view_time or 0.0), rebuilt)
+        gpu.state.blend_set('ALPHA_PREMULT')
+        gpu.state.line_width_set(context.preferences.addons[__name__].preferences.icon_thickness)
+        shader.uniform_float("color", (0.0, 1.0 * context.preferences.addons[__name__].preferences.icon_alpha, 0.0, 1 * context.preferences.addons[__name__].preferences.icon_alpha))
+        plus_batch.draw(shader)
+        shader.uniform_float("color", (1.0 * context.preferences.addons[__name__].preferences.icon_alpha, 0.0, 0.0, 1 * context.preferences.addons[__name__].preferences.icon_alpha))
+        minus_batch.draw(shader)
+        gpu.state.blend_set(context.preferences.addons[__name__].preferences.blend)
+        shader.uniform_float("color", (context.preferences.addons[__name__].preferences.plane_color))
+        gpu.state.depth_test_set('LESS')
+        gpu.state.depth_mask_set(True)
+        rect_batch.draw(shader)
+        stack_batch = get_stack_batch(context, shader)
+        if stack_batch is not None:
+            stack_batch.draw(shader)
+        gpu.state.depth_mask_set(False)
+        profiling.end()
+        
+
+
+classes = (
+    ProjectionPlane,
+    VertexProjectionProperties,
+    VertexProjectionPanel,
+    VertexProjectionOptionsPanel,
+    VertexProjectionStackPanel,
+    VertexProjectionPerformancePanel,
+    VisualDebugOptionsPanel,
+    SetNormal,
+    SetNormalSel,
+    ExecuteProjection,
+    ProjectPlaneStack,
+    AddStackPlane,
+    RemoveStackPlane,
+    ProjectOnSurface,
+    InteractiveProjection,
+    ExportProfile,
+    ClearProfile,
+    ShowDebugHelper
+)
+
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+    bpy.types.Scene.vertex_projection_props = PointerProperty(type=VertexProjectionProperties)
+    # The add-on is not in the preferences yet while it is enabled for the first time
+    addon = bpy.context.preferences.addons.get(__name__)
+    if addon is not None:
+        profiling.set_enabled(addon.preferences.enable_profiling, addon.preferences.profile_allocations)
+        precompute.set_enabled(addon.preferences.use_precompute)
+    else:
+        # Follow the default of the preference, the module state may be left over from the last time
+        precompute.set_enabled(VisualDebugOptionsPanel.bl_rna.properties["use_precompute"].default)
+    bpy.app.handlers.depsgraph_update_post.append(update_mesh_data)
+    bpy.app.handlers.load_post.append(update_mode)
+    bpy.app.handlers.load_post.append(subscribe_cursor)
+    bpy.app.handlers.undo_post.append(undo_mesh_data)
+    for handlers in (bpy.app.handlers.redo_post, bpy.app.handlers.load_post):
+        handlers.append(clear_mesh_data)
+    subscribe_cursor()
+
+
+def unregister():
+    global draw_handler_handle, rect_batch, plus_batch, minus_batch, lines_batch, view_batch, lines_pos, rect_key, lines_key, view_key, stack_batch, stack_key
+
+    precompute.set_enabled(False)
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
+
+    del bpy.types.Scene.vertex_projection_props
+
+    # Check if update_mode is in the list before removing
+    if update_mode in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(update_mode)
+    if update_mesh_data in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(update_mesh_data)
+    if subscribe_cursor in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(subscribe_cursor)
+    if undo_mesh_data in bpy.app.handlers.undo_post:
+        bpy.app.handlers.undo_post.remove(undo_mesh_data)
+    for handlers in (bpy.app.handlers.redo_post, bpy.app.handlers.load_post):
+        if clear_mesh_data in handlers:
+            handlers.remove(clear_mesh_data)
+    bpy.msgbus.clear_by_owner(cursor_owner)
+    snapshot.invalidate()
+    snapshot.originals.clear()
+    surface.invalidate()
+    profiling.set_enabled(False)
+
+    # Cleanup draw handler and batches
+    if draw_handler_handle is not None:
+        bpy.types.SpaceView3D.draw_handler_remove(draw_handler_handle, 'WINDOW')
+        draw_handler_handle = None
+        rect_batch = None
+        plus_batch = None
+        minus_batch = None
+        lines_batch = None
+        view_batch = None
+        lines_pos = None
+        rect_key = None
+        lines_key = None
+        view_key = None
+        stack_batch = None
+        stack_key = None
+
+
+if __name__ == "__main__":
+    register()
\ No newline at end of file
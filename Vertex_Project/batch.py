@@ -0,0 +1,332 @@
+"""Command line batch projection over many .blend files
+
+Projects every file onto the same plane in a pool of background Blender processes and writes
+one report entry per file with element counts, timings and the elements that do not intersect
+the plane:
+
+    blender --background --python Vertex_Project/batch.py -- \
+        --normal 0 0 1 --origin 0 0 0 --side positive --mode vertices \
+        --vertex-group Clamp --jobs 8 --output-dir projected --report report.json assets/*.blend
+
+The coordinator only starts processes, so it also runs from a plain Python interpreter if
+--blender points to the Blender executable. Every worker is a separate Blender process that
+opens one file, projects it in object mode with foreach_get/foreach_set and saves it. Without
+--output-dir or --in-place nothing is saved and only the report is written.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+if __package__:
+    from . import projection
+else:
+    # Run as a script, import the sibling modules directly since the package __init__ needs bpy
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import projection
+
+
+def load_snapshot():
+    """snapshot needs bpy, so it is only imported inside the Blender workers"""
+    if __package__:
+        from . import snapshot
+    else:
+        import snapshot
+    return snapshot
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Project meshes in many .blend files onto a plane")
+    parser.add_argument("files", nargs="*", help=".blend files to project")
+    parser.add_argument("--normal", type=float, nargs=3, default=(0.0, 0.0, 1.0), help="World space plane normal")
+    parser.add_argument("--origin", type=float, nargs=3, default=(0.0, 0.0, 0.0), help="World space point on the plane")
+    parser.add_argument("--side", choices=("positive", "negative", "closest"), default="positive")
+    parser.add_argument("--mode", choices=("vertices", "edges"), default="vertices")
+    parser.add_argument("--direction", type=float, nargs=3, help="Alternative projection direction for vertex mode")
+    parser.add_argument("--no-outside-edges", action="store_true", help="Skip edges that do not cross the plane")
+    parser.add_argument("--edge-rule", choices=("sequential", "order", "shortest", "perpendicular"), default="sequential",
+                        help="How vertices shared by several edges are projected, edge by edge in index order by default")
+    parser.add_argument("--chunk-size", type=int,
+                        help="Stream the projection in chunks of this many elements to keep memory flat on huge meshes")
+    parser.add_argument("--precision", choices=("float32", "float64"), default="float32",
+                        help="Coordinate buffer precision in streaming mode")
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument("--vertex-group", help="Project the vertices in this vertex group")
+    selection.add_argument("--all", action="store_true", help="Project all vertices")
+    parser.add_argument("--objects", nargs="+", help="Object names to project, all meshes by default")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Number of worker processes")
+    parser.add_argument("--blender", help="Blender executable used for the workers")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--output-dir", help="Save projected files into this folder")
+    output.add_argument("--in-place", action="store_true", help="Overwrite the input files")
+    parser.add_argument("--report", help="Write the JSON report to this file")
+    parser.add_argument("--worker-report", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def script_argv():
+    """Arguments after '--' when running inside Blender, otherwise the regular arguments"""
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return sys.argv[1:]
+
+
+def selection_rule(options):
+    if options.vertex_group:
+        return f"group:{options.vertex_group}"
+    return "all" if options.all else "selected"
+
+
+def reference_key(mesh):
+    """Reference shape key of a mesh, None without shape keys
+
+    Shape keys override mesh.vertices, so meshes with shape keys are projected on their reference
+    key and both are written, like the projection operator does in object mode.
+    """
+    return mesh.shape_keys.reference_key if mesh.shape_keys else None
+
+
+def project_object(obj, options):
+    """Project one mesh object in object mode, returns its report entry"""
+    import numpy as np
+    snapshot = load_snapshot()
+
+    entry = {"object": obj.name, "mesh": obj.data.name, "mode": options.mode, "selection": selection_rule(options)}
+    if options.chunk_size and (options.mode == "vertices" or options.edge_rule in ("sequential", "order")):
+        return stream_object(obj, options, entry)
+    start = time.perf_counter()
+    mesh = obj.data
+    co, sel = snapshot.read_mesh_verts(mesh)
+    key_block = reference_key(mesh)
+    if key_block is not None:
+        co = snapshot.read_shape_key(key_block)
+        entry["shape_key"] = key_block.name
+    if options.vertex_group:
+        sel = snapshot.vertex_group_mask(obj, options.vertex_group)
+        if sel is None:
+            entry["error"] = f"No vertex group named {options.vertex_group}"
+            return entry
+    elif options.all:
+        sel = np.ones(len(co), dtype=bool)
+
+    edges = None
+    if options.mode == "edges":
+        edges, edge_sel = snapshot.read_mesh_edges(mesh)
+        if options.vertex_group or options.all:
+            edge_sel = sel[edges[:, 0]] & sel[edges[:, 1]]
+        selection = np.flatnonzero(edge_sel)
+    else:
+        selection = np.flatnonzero(sel)
+    entry["read_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indices, projected, failed, reasons = projection.project_selection(
+        co, np.array(obj.matrix_world), options.origin, options.normal, selection, edges=edges,
+        direction=options.direction, is_positive=options.side != "negative", is_closest=options.side == "closest",
+        use_outside_edges=not options.no_outside_edges,
+        edge_rule=options.edge_rule.upper())
+    entry["project_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    co[indices] = projected
+    if key_block is not None:
+        snapshot.write_shape_key(key_block, co)
+    snapshot.write_mesh_verts(mesh, co)
+    entry["write_seconds"] = time.perf_counter() - start
+
+    entry["vertices"] = len(co)
+    entry["selected"] = len(selection)
+    entry["moved"] = len(indices)
+    entry["failed_count"] = len(failed)
+    entry["failed_by_reason"] = projection.count_failures(reasons)
+    # Vertex indices in vertex mode, edge indices in edge mode
+    entry["failed"] = failed.tolist()
+    return entry
+
+
+def stream_object(obj, options, entry):
+    """project_object in chunks of --chunk-size elements, working in place on one coordinate buffer"""
+    import numpy as np
+    snapshot = load_snapshot()
+
+    start = time.perf_counter()
+    mesh = obj.data
+    co, sel = snapshot.read_mesh_verts(mesh, dtype=np.dtype(options.precision))
+    key_block = reference_key(mesh)
+    if key_block is not None:
+        co = snapshot.read_shape_key(key_block, dtype=np.dtype(options.precision))
+        entry["shape_key"] = key_block.name
+    if options.vertex_group:
+        sel = snapshot.vertex_group_mask(obj, options.vertex_group)
+        if sel is None:
+            entry["error"] = f"No vertex group named {options.vertex_group}"
+            return entry
+    elif options.all:
+        sel = np.ones(len(co), dtype=bool)
+
+    edges = None
+    mask = sel
+    if options.mode == "edges":
+        edges, mask = snapshot.read_mesh_edges(mesh, dtype=np.int32)
+        if options.vertex_group or options.all:
+            mask = sel[edges[:, 0]] & sel[edges[:, 1]]
+    entry["read_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    written, chunks, failed, reasons = projection.project_mask_chunked(
+        co, np.array(obj.matrix_world), options.origin, options.normal, mask, options.chunk_size, edges=edges,
+        direction=options.direction, is_positive=options.side != "negative", is_closest=options.side == "closest",
+        use_outside_edges=not options.no_outside_edges, edge_rule=options.edge_rule.upper())
+    entry["project_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if co.dtype != np.float32:
+        co = snapshot.narrow_to_float32(co)
+    if key_block is not None:
+        snapshot.write_shape_key(key_block, co)
+    snapshot.write_mesh_verts(mesh, co)
+    entry["write_seconds"] = time.perf_counter() - start
+
+    entry["precision"] = options.precision
+    entry["chunk_size"] = options.chunk_size
+    entry["chunks"] = chunks
+    entry["vertices"] = len(co)
+    entry["selected"] = int(np.count_nonzero(mask))
+    entry["moved"] = written
+    entry["failed_count"] = len(failed)
+    entry["failed_by_reason"] = projection.count_failures(reasons)
+    entry["failed"] = failed.tolist()
+    return entry
+
+
+def run_worker(options):
+    """Project the file Blender opened and write its report"""
+    import bpy
+
+    report = {"file": bpy.data.filepath, "objects": []}
+    try:
+        if options.objects:
+            objects = [bpy.data.objects[name] for name in options.objects if name in bpy.data.objects]
+            report["missing_objects"] = [name for name in options.objects if name not in bpy.data.objects]
+        else:
+            objects = list(bpy.data.objects)
+
+        done_meshes = set()
+        for obj in objects:
+            if obj.type != 'MESH':
+                continue
+            # Instances share their mesh, project it once with the first object using it
+            if obj.data.name_full in done_meshes:
+                report["objects"].append({"object": obj.name, "mesh": obj.data.name, "skipped": "shared mesh"})
+                continue
+            done_meshes.add(obj.data.name_full)
+            report["objects"].append(project_object(obj, options))
+
+        start = time.perf_counter()
+        if options.output_dir:
+            path = os.path.join(options.output_dir, os.path.basename(bpy.data.filepath))
+            bpy.ops.wm.save_as_mainfile(filepath=path, copy=True)
+            report["saved"] = path
+        elif options.in_place:
+            bpy.ops.wm.save_mainfile()
+            report["saved"] = bpy.data.filepath
+        report["save_seconds"] = time.perf_counter() - start
+    except Exception as error:
+        report["error"] = repr(error)
+
+    with open(options.worker_report, "w") as file:
+        json.dump(report, file)
+    return 1 if "error" in report else 0
+
+
+def worker_command(blender, path, options, worker_report):
+    command = [blender, "--background", "--factory-startup", path, "--python", os.path.abspath(__file__), "--"]
+    command += ["--normal", *map(str, options.normal), "--origin", *map(str, options.origin)]
+    command += ["--side", options.side, "--mode", options.mode, "--edge-rule", options.edge_rule]
+    command += ["--worker-report", worker_report]
+    if options.direction:
+        command += ["--direction", *map(str, options.direction)]
+    if options.no_outside_edges:
+        command.append("--no-outside-edges")
+    if options.chunk_size:
+        command += ["--chunk-size", str(options.chunk_size), "--precision", options.precision]
+    if options.vertex_group:
+        command += ["--vertex-group", options.vertex_group]
+    elif options.all:
+        command.append("--all")
+    if options.objects:
+        command += ["--objects", *options.objects]
+    if options.output_dir:
+        command += ["--output-dir", os.path.abspath(options.output_dir)]
+    elif options.in_place:
+        command.append("--in-place")
+    return command
+
+
+def run_file(blender, path, options):
+    """Run one worker process and return the report of its file"""
+    handle, worker_report = tempfile.mkstemp(suffix=".json")
+    os.close(handle)
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(worker_command(blender, path, options, worker_report), capture_output=True, text=True)
+        try:
+            with open(worker_report) as file:
+                report = json.load(file)
+        except (OSError, ValueError):
+            report = {"file": path, "error": f"Blender exited with code {result.returncode}", "stderr": result.stderr[-2000:]}
+    finally:
+        os.remove(worker_report)
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+
+def find_blender(options):
+    if options.blender:
+        return options.blender
+    try:
+        import bpy
+        return bpy.app.binary_path
+    except ImportError:
+        return shutil.which("blender") or "blender"
+
+
+def run_batch(options):
+    blender = find_blender(options)
+    if options.output_dir:
+        os.makedirs(options.output_dir, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=max(options.jobs or 1, 1)) as pool:
+        reports = list(pool.map(lambda path: run_file(blender, os.path.abspath(path), options), options.files))
+
+    if options.chunk_size:
+        print(f"Streaming in chunks of {options.chunk_size} elements with {options.precision} buffers")
+    for report in reports:
+        objects = report.get("objects", [])
+        moved = sum(entry.get("moved", 0) for entry in objects)
+        failed = sum(entry.get("failed_count", 0) for entry in objects)
+        status = report.get("error", "ok")
+        print(f"{report['file']}: {len(objects)} objects, {moved} moved, {failed} failed, {report['seconds']:.2f} s ({status})")
+
+    if options.report:
+        with open(options.report, "w") as file:
+            json.dump(reports, file, indent=2)
+    return 1 if any("error" in report for report in reports) else 0
+
+
+def main(argv=None):
+    options = parse_args(script_argv() if argv is None else argv)
+    if options.worker_report:
+        return run_worker(options)
+    return run_batch(options)
+
+
+if __name__ == "__main__":
+    code = main()
+    if code:
+        sys.exit(code)
@@ -0,0 +1,151 @@
+"""Bulk access to the points of curve and Grease Pencil objects
+
+Points are read and written in blocks, one foreach_get/foreach_set call per block: the control
+points and both handles of every Bezier spline, the points of every poly or NURBS spline, the
+points of every stroke on the current frame of a legacy Grease Pencil layer and the position
+attribute of the current drawing of a Grease Pencil layer. Layer transforms are applied, so all
+coordinates come out in object space and the projection treats them like mesh vertices.
+"""
+import numpy as np
+
+POINT_OBJECT_TYPES = {'CURVE', 'GPENCIL', 'GREASEPENCIL'}
+# Legacy Grease Pencil objects have their own edit mode
+EDIT_MODES = {'EDIT', 'EDIT_GPENCIL'}
+
+
+class Block:
+    """One run of points read and written with a single foreach_get/foreach_set call"""
+
+    def __init__(self, data, attribute, width, sel, matrix=None, drawing=None):
+        self.data = data
+        self.attribute = attribute
+        # 4 for NURBS points, which carry their weight along
+        self.width = width
+        self.sel = sel
+        self.matrix = matrix
+        self.drawing = drawing
+        self.weights = None
+
+    def read(self):
+        buffer = np.empty(len(self.data) * self.width, dtype=np.float32)
+        self.data.foreach_get(self.attribute, buffer)
+        buffer = buffer.reshape(-1, self.width)
+        if self.width == 4:
+            self.weights = buffer[:, 3].copy()
+        co = buffer[:, :3].astype(np.float64)
+        if self.matrix is not None:
+            co = co @ self.matrix[:3, :3].T + self.matrix[:3, 3]
+        return co
+
+    def write(self, co):
+        if self.matrix is not None:
+            inverse = np.linalg.inv(self.matrix)
+            co = co @ inverse[:3, :3].T + inverse[:3, 3]
+        buffer = np.empty((len(co), self.width), dtype=np.float32)
+        buffer[:, :3] = co
+        if self.width == 4:
+            buffer[:, 3] = self.weights
+        self.data.foreach_set(self.attribute, buffer.ravel())
+        if self.drawing is not None and hasattr(self.drawing, "tag_positions_changed"):
+            self.drawing.tag_positions_changed()
+
+
+def read_flags(data, attribute):
+    flags = np.empty(len(data), dtype=bool)
+    data.foreach_get(attribute, flags)
+    return flags
+
+
+def layer_matrix(layer, attribute):
+    """Transform of a Grease Pencil layer, None if it has none"""
+    matrix = getattr(layer, attribute, None)
+    if matrix is None:
+        return None
+    matrix = np.array(matrix, dtype=np.float64)
+    return None if np.allclose(matrix, np.eye(4)) else matrix
+
+
+def curve_blocks(curve):
+    for spline in curve.splines:
+        if spline.type == 'BEZIER':
+            points = spline.bezier_points
+            for attribute, select in (("co", "select_control_point"), ("handle_left", "select_left_handle"),
+                                      ("handle_right", "select_right_handle")):
+                yield Block(points, attribute, 3, read_flags(points, select))
+        else:
+            yield Block(spline.points, "co", 4, read_flags(spline.points, "select"))
+
+
+def gpencil_blocks(gpd):
+    """Stroke points of the legacy Grease Pencil data of Blender 4.2 and older"""
+    for layer in gpd.layers:
+        if layer.hide or layer.lock or layer.active_frame is None:
+            continue
+        matrix = layer_matrix(layer, "matrix_layer")
+        for stroke in layer.active_frame.strokes:
+            yield Block(stroke.points, "co", 3, read_flags(stroke.points, "select"), matrix)
+
+
+def grease_pencil_blocks(grease_pencil):
+    """Position attribute of the current drawing of every editable layer, Blender 4.3 and newer"""
+    for layer in grease_pencil.layers:
+        if layer.hide or layer.lock:
+            continue
+        frame = layer.current_frame()
+        if frame is None or frame.drawing is None:
+            continue
+        drawing = frame.drawing
+        positions = drawing.attributes.get("position")
+        if positions is None:
+            continue
+        count = len(positions.data)
+        selection = drawing.attributes.get(".selection")
+        if selection is None:
+            # Like all curves geometry, a missing selection attribute means everything is selected
+            sel = np.ones(count, dtype=bool)
+        else:
+            if selection.data_type == 'BOOLEAN':
+                sel = read_flags(selection.data, "value")
+            else:
+                values = np.empty(len(selection.data), dtype=np.float32)
+                selection.data.foreach_get("value", values)
+                sel = values > 0
+            if selection.domain == 'CURVE':
+                # Stroke select mode stores one flag per stroke, which applies to all of its points
+                offsets = np.empty(len(drawing.curve_offsets), dtype=np.int32)
+                drawing.curve_offsets.foreach_get("value", offsets)
+                sel = np.repeat(sel, np.diff(offsets))
+        yield Block(positions.data, "vector", 3, sel, layer_matrix(layer, "matrix_local"), drawing)
+
+
+def point_blocks(obj):
+    if obj.type == 'CURVE':
+        return list(curve_blocks(obj.data))
+    if obj.type == 'GPENCIL':
+        return list(gpencil_blocks(obj.data))
+    return list(grease_pencil_blocks(obj.data))
+
+
+def read_points(obj):
+    """Blocks, object space coordinates (N, 3) and selection flags (N,) of all editable points of an object"""
+    blocks = point_blocks(obj)
+    if not blocks:
+        return blocks, np.zeros((0, 3)), np.zeros(0, dtype=bool)
+    co = np.concatenate([block.read() for block in blocks])
+    sel = np.concatenate([block.sel for block in blocks])
+    return blocks, co, sel
+
+
+def write_points(obj, blocks, co, indices=None):
+    """Write the coordinates read with read_points back, only the blocks holding one of indices if given"""
+    ends = np.cumsum([len(block.sel) for block in blocks])
+    touched = None
+    if indices is not None:
+        touched = np.zeros(len(blocks), dtype=bool)
+        touched[np.searchsorted(ends, indices, side='right')] = True
+    start = 0
+    for index, (block, end) in enumerate(zip(blocks, ends.tolist())):
+        if touched is None or touched[index]:
+            block.write(co[start:end])
+        start = end
+    obj.data.update_tag()
@@ -0,0 +1,126 @@
+"""Speculative projection while the plane is being edited
+
+Property updates snapshot the selection on the main thread and compute the positive, negative
+and closest outcome of every object in edit mode on a thread pool, where the NumPy math runs
+without holding the GIL most of the time. ExecuteProjection then only checks that a result was
+computed from the same inputs and the same mesh arrays and writes it back. Every new
+update cancels the jobs that have not started yet and discards the results of the others.
+"""
+import concurrent.futures
+
+import bpy
+import numpy as np
+
+from . import snapshot
+from .projection import project_selection
+
+SIDES = ("positive", "negative", "closest")
+
+enabled = False
+executor = None
+# Pending or finished jobs by object name, replaced on every update
+jobs = {}
+
+
+class Job:
+    def __init__(self, key, mesh_data, future):
+        self.key = key
+        self.mesh_data = mesh_data
+        self.future = future
+
+
+def applicable(props):
+    """Only the plain plane projection is precomputed"""
+    return props.direction_mode == 'GLOBAL' and not props.use_mirror
+
+
+def make_key(obj, props, plane_co):
+    """Every input of the projection of one object apart from the mesh arrays"""
+    return (
+        obj.data.name_full,
+        tuple(v for row in obj.matrix_world for v in row),
+        tuple(plane_co),
+        tuple(props.plane_normal),
+        tuple(props.vertex_normal) if props.use_vertex_normal else None,
+        props.use_vertices_only,
+        props.use_outside_edges,
+        props.edge_rule,
+    )
+
+
+def compute(co, edges, selection, mat, plane_co, plane_no, direction, use_outside_edges, edge_rule):
+    """Outcome of every side for one object, runs on the worker threads"""
+    if edges is None:
+        # Vertex projection does not depend on the side
+        result = project_selection(co, mat, plane_co, plane_no, selection, direction=direction)
+        return dict.fromkeys(SIDES, result)
+    return {
+        side: project_selection(
+            co, mat, plane_co, plane_no, selection, edges=edges, is_positive=side != "negative",
+            is_closest=side == "closest", use_outside_edges=use_outside_edges, edge_rule=edge_rule)
+        for side in SIDES
+    }
+
+
+def cancel():
+    for job in jobs.values():
+        job.future.cancel()
+    jobs.clear()
+
+
+def schedule(objects):
+    """Start computing the projection of the given objects with the current settings"""
+    global executor
+    cancel()
+    context = bpy.context
+    props = context.scene.vertex_projection_props
+    if not enabled or not applicable(props):
+        return
+    if executor is None:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="vertex_projection")
+
+    plane_co = tuple(context.scene.cursor.location)
+    plane_no = tuple(props.plane_normal)
+    use_vertices_only = props.use_vertices_only
+    direction = tuple(props.vertex_normal) if use_vertices_only and props.use_vertex_normal else plane_no
+    edge_rule = props.edge_rule
+    for obj in objects:
+        if obj.type != 'MESH' or obj.mode != 'EDIT':
+            continue
+        # Reading the edit mesh has to happen here, the workers only see the arrays
+        mesh_data = snapshot.get_snapshot(obj, edges=not use_vertices_only)
+        selection = np.flatnonzero(mesh_data.sel if use_vertices_only else mesh_data.edge_sel)
+        if not len(selection):
+            continue
+        future = executor.submit(
+            compute, mesh_data.co, None if use_vertices_only else mesh_data.edges, selection,
+            np.array(obj.matrix_world), plane_co, plane_no, direction, props.use_outside_edges, edge_rule)
+        jobs[obj.name_full] = Job(make_key(obj, props, plane_co), mesh_data, future)
+
+
+def take(obj, props, plane_co, mesh_data, side):
+    """Precomputed result of one side if it was computed from these inputs and mesh arrays, otherwise None
+
+    mesh_data is the snapshot the operator just read. Edits made by operators called back to back
+    from a script do not drop the cached snapshot the job was started from, so the arrays are
+    compared rather than trusting the cache.
+    """
+    job = jobs.pop(obj.name_full, None)
+    if job is None or job.future.cancelled() or not job.mesh_data.same_data(mesh_data):
+        return None
+    if not applicable(props) or job.key != make_key(obj, props, plane_co):
+        return None
+    try:
+        return job.future.result()[side]
+    except Exception:
+        return None
+
+
+def set_enabled(value):
+    global enabled, executor
+    enabled = value
+    if not value:
+        cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            executor = None
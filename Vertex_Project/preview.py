@@ -0,0 +1,58 @@
+"""View culling and level of detail for the preview lines
+
+Like projection.py this only needs NumPy. Lines are stored as pairs of rows in a (2N, 3) world
+space position array, the way they are uploaded to the LINES batch.
+"""
+import numpy as np
+
+
+def clip_space(co, perspective_matrix):
+    """Homogeneous clip space coordinates (N, 4) of world space points"""
+    mat = np.array(perspective_matrix, dtype=np.float64)
+    return co @ mat[:, :3].T + mat[:, 3]
+
+
+def outcodes(clip):
+    """Bit per frustum plane the clip space point is outside of"""
+    x, y, z, w = clip.T
+    codes = np.zeros(len(clip), dtype=np.uint8)
+    for bit, outside in enumerate((x < -w, x > w, y < -w, y > w, z < -w, z > w)):
+        codes |= outside.astype(np.uint8) << bit
+    return codes
+
+
+def visible_lines(pos, perspective_matrix):
+    """Mask of the lines that may be inside the view frustum
+
+    A line is culled only when both ends are outside of the same frustum plane, so lines
+    crossing the view are kept even when both ends are off screen.
+    """
+    codes = outcodes(clip_space(pos, perspective_matrix))
+    return (codes[0::2] & codes[1::2]) == 0
+
+
+def decimate_lines(pos, perspective_matrix, region_size, budget):
+    """Indices of a representative subset of about budget lines
+
+    The region is split into square cells sized so that budget cells cover it, and the first
+    line starting in each cell is kept.
+    """
+    width, height = region_size
+    clip = clip_space(pos[0::2], perspective_matrix)
+    w = np.maximum(clip[:, 3], 1e-6)
+    x = (clip[:, 0] / w * 0.5 + 0.5) * width
+    y = (clip[:, 1] / w * 0.5 + 0.5) * height
+
+    cell = max(np.sqrt(width * height / max(budget, 1)), 1.0)
+    columns = int(np.ceil(width / cell)) + 1
+    cells = np.floor(np.clip(y, 0, height) / cell) * columns + np.floor(np.clip(x, 0, width) / cell)
+    _, first = np.unique(cells.astype(np.int64), return_index=True)
+    return np.sort(first)
+
+
+def line_positions(pos, indices):
+    """Start and end rows of the given lines"""
+    rows = np.empty(len(indices) * 2, dtype=np.int64)
+    rows[0::2] = indices * 2
+    rows[1::2] = indices * 2 + 1
+    return pos[rows]
@@ -0,0 +1,139 @@
+"""Optional per-phase timing of the operators and the draw handler
+
+A record is opened with begin() for one operator call or redraw, timed with phase() blocks and
+closed with end(), which stores it in a ring buffer. Redraws happen far more often than operator
+calls, so their records go into a smaller ring buffer of their own and never push the operator
+records out. While profiling is disabled every call returns right away and phase() hands out one
+shared no-op context manager.
+"""
+import collections
+import contextlib
+import csv
+import json
+import time
+import tracemalloc
+
+enabled = False
+track_allocations = False
+records = collections.deque(maxlen=256)
+draw_records = collections.deque(maxlen=32)
+
+_current = None
+_null_phase = contextlib.nullcontext()
+
+
+class Record:
+    """Phases of one operator call or redraw"""
+
+    def __init__(self, name, is_draw):
+        self.name = name
+        self.is_draw = is_draw
+        self.timestamp = time.time()
+        self.start = time.perf_counter()
+        self.total = 0.0
+        self.phases = {}
+        self.allocated = {}
+        self.counts = {}
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "timestamp": self.timestamp,
+            "total": self.total,
+            "phases": self.phases,
+            "allocated": self.allocated,
+            "counts": self.counts,
+        }
+
+
+class _Phase:
+    def __init__(self, record, name):
+        self.record = record
+        self.name = name
+
+    def __enter__(self):
+        if track_allocations:
+            tracemalloc.reset_peak()
+            self.memory = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        # Phases run more than once per record (once per object) add up
+        self.record.phases[self.name] = self.record.phases.get(self.name, 0.0) + elapsed
+        if track_allocations:
+            peak = tracemalloc.get_traced_memory()[1] - self.memory
+            self.record.allocated[self.name] = max(self.record.allocated.get(self.name, 0), peak)
+
+
+def begin(name, is_draw=False):
+    global _current
+    if not enabled:
+        return
+    if track_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _current = Record(name, is_draw)
+
+
+def phase(name):
+    if _current is None:
+        return _null_phase
+    return _Phase(_current, name)
+
+
+def count(name, value):
+    if _current is not None:
+        _current.counts[name] = _current.counts.get(name, 0) + value
+
+
+def end():
+    global _current
+    if _current is None:
+        return
+    _current.total = time.perf_counter() - _current.start
+    (draw_records if _current.is_draw else records).append(_current)
+    _current = None
+
+
+def set_enabled(value, allocations=False):
+    global enabled, track_allocations, _current
+    enabled = value
+    track_allocations = value and allocations
+    _current = None
+    if not track_allocations and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def all_records():
+    """Operator records followed by redraw records"""
+    return list(records) + list(draw_records)
+
+
+def clear():
+    records.clear()
+    draw_records.clear()
+
+
+def latest():
+    """Most recent record of every name"""
+    result = {}
+    for record in all_records():
+        result[record.name] = record
+    return list(result.values())
+
+
+def dump_json(path):
+    with open(path, "w") as file:
+        json.dump([record.as_dict() for record in all_records()], file, indent=2)
+
+
+def dump_csv(path):
+    """One row per phase of every record"""
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(("name", "timestamp", "phase", "seconds", "allocated_bytes", "counts"))
+        for record in all_records():
+            counts = ";".join(f"{key}={value}" for key, value in record.counts.items())
+            writer.writerow((record.name, record.timestamp, "total", record.total, "", counts))
+            for name, seconds in record.phases.items():
+                writer.writerow((record.name, record.timestamp, name, seconds, record.allocated.get(name, ""), ""))
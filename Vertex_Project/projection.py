@@ -0,0 +1,491 @@
+"""Projection math for Vertex Project
+
+Everything in this module works on plain NumPy arrays and does not import bpy, bmesh or
+mathutils, so it can be profiled and benchmarked outside of Blender. The operators read
+mesh data into arrays, call these functions and write the results back.
+"""
+import numpy as np
+
+# Same threshold intersect_line_plane uses to treat a line as parallel to the plane
+FLT_EPSILON = 1.1920928955078125e-07
+
+# Reasons an element does not intersect the plane
+PARALLEL = 1
+DEGENERATE = 2
+# No hit on the target surface of a surface projection
+MISSED = 3
+FAILURE_NAMES = {PARALLEL: "parallel", DEGENERATE: "degenerate", MISSED: "missed"}
+
+
+def plane_to_object_space(mat, plane_co, plane_no):
+    """Move a world space plane into the object space of the 4x4 matrix"""
+    mat = np.array(mat, dtype=np.float64)
+    linear = mat[:3, :3]
+    origin = np.linalg.solve(linear, np.asarray(plane_co, dtype=np.float64) - mat[:3, 3])
+    normal = linear.T @ np.asarray(plane_no, dtype=np.float64)
+    return origin, normal
+
+
+def direction_to_object_space(mat, direction):
+    """Move a world space direction into the object space of the 4x4 matrix"""
+    linear = np.array(mat, dtype=np.float64)[:3, :3]
+    return np.linalg.solve(linear, np.asarray(direction, dtype=np.float64))
+
+
+def project_points_on_plane(co, direction, origin, normal):
+    """Batched intersect_line_plane for lines starting at co along direction
+
+    Returns the intersections and a mask of the lines that are not parallel to the plane.
+    """
+    co = np.asarray(co, dtype=np.float64)
+    denom = np.broadcast_to(np.dot(direction, normal), co.shape[:1])
+    hit = np.abs(denom) > FLT_EPSILON
+    safe_denom = np.where(hit, denom, 1.0)
+    lam = -((co - origin) @ normal) / safe_denom
+    return co + lam[:, None] * direction, hit
+
+
+def edge_sides(dist_a, dist_b, is_positive, is_closest, use_outside_edges):
+    """Which vertex of every edge moves, True for the second one, and a mask of processed edges"""
+    closer_b = np.abs(dist_a) > np.abs(dist_b)
+    if is_closest:
+        return closer_b, np.ones(len(dist_a), dtype=bool)
+    same_side = ((dist_a > 0) & (dist_b > 0)) | ((dist_a < 0) & (dist_b < 0))
+    active = ~same_side if not use_outside_edges else np.ones(len(dist_a), dtype=bool)
+    return np.where(same_side, closer_b, dist_b > 0 if is_positive else dist_b < 0), active
+
+
+def project_edges_on_plane(co, edges, origin, normal, is_positive, is_closest, use_outside_edges):
+    """Batched edge projection, slides one vertex of every edge along the edge onto the plane
+
+    Edges with both vertices on the same side move their closest vertex (only if use_outside_edges),
+    edges crossing the plane move the vertex on the positive or negative side. With is_closest every
+    edge moves its closest vertex. Returns the index of the vertex each edge moves, its projected
+    coordinate, a mask of processed edges and a mask of edges that are not parallel to the plane.
+    """
+    co_a = co[edges[:, 0]]
+    co_b = co[edges[:, 1]]
+    dist_a = (co_a - origin) @ normal
+    dist_b = (co_b - origin) @ normal
+    move_b, active = edge_sides(dist_a, dist_b, is_positive, is_closest, use_outside_edges)
+
+    # intersect_line_plane(v1, v2) when moving the second vertex, (v2, v1) when moving the first
+    start = np.where(move_b[:, None], co_a, co_b)
+    direction = np.where(move_b[:, None], co_b - co_a, co_a - co_b)
+    denom = direction @ normal
+    hit = np.abs(denom) > FLT_EPSILON
+    lam = -np.where(move_b, dist_a, dist_b) / np.where(hit, denom, 1.0)
+
+    moved = np.where(move_b, edges[:, 1], edges[:, 0])
+    return moved, start + lam[:, None] * direction, active, hit
+
+
+def project_edge_vertices(co, edges, origin, normal, is_positive, is_closest, use_outside_edges, rule):
+    """Edge projection that moves every vertex once, along one of the edges that would move it
+
+    With rule 'SHORTEST' the shortest of those edges is used, with 'PERPENDICULAR' the one most
+    perpendicular to the plane. Edges parallel to the plane are only used if a vertex has no other,
+    and ties go to the first edge. Returns the unique moved vertex indices, their projected
+    coordinates, a mask of the vertices whose edge is not parallel to the plane and the row of the
+    edge each vertex used.
+    """
+    dist_a = (co[edges[:, 0]] - origin) @ normal
+    dist_b = (co[edges[:, 1]] - origin) @ normal
+    move_b, active = edge_sides(dist_a, dist_b, is_positive, is_closest, use_outside_edges)
+
+    rows = np.flatnonzero(active)
+    move_b = move_b[rows]
+    moved = np.where(move_b, edges[rows, 1], edges[rows, 0])
+    fixed = np.where(move_b, edges[rows, 0], edges[rows, 1])
+    direction = co[moved] - co[fixed]
+    denom = direction @ normal
+    hit = np.abs(denom) > FLT_EPSILON
+
+    if rule == 'SHORTEST':
+        score = np.einsum("ij,ij->i", direction, direction)
+    else:
+        score = -np.abs(denom) / np.maximum(np.linalg.norm(direction, axis=1), np.finfo(np.float64).tiny)
+    score = np.where(hit, score, np.inf)
+
+    # Sort by vertex, then score, then edge order and keep the first edge of every vertex
+    order = np.lexsort((rows, score, moved))
+    sorted_moved = moved[order]
+    first = order[np.concatenate(([True], sorted_moved[1:] != sorted_moved[:-1]))] if len(order) else order
+
+    start = co[fixed[first]]
+    lam = -np.where(move_b[first], dist_a[rows[first]], dist_b[rows[first]]) / np.where(hit[first], denom[first], 1.0)
+    return moved[first], start + lam[:, None] * direction[first], hit[first], rows[first]
+
+
+def project_edges_sequential(co, edges, origin, normal, is_positive, is_closest, use_outside_edges, on_plane=None):
+    """Edge projection that applies the edges one after another in index order, like the original loop
+
+    Every edge sees the coordinates the edges before it left, so an edge sharing a vertex with an
+    earlier one starts from where that edge moved it. A moved vertex counts as lying on the plane,
+    otherwise rounding would pick the side of the next edge through it. on_plane optionally flags
+    such vertices of the whole mesh across calls and is updated. Edges that share no vertex with
+    another edge or a moved vertex do not depend on each other and are projected in one batch,
+    only the connected ones run in a loop. Returns the unique moved vertex indices, their final
+    coordinates, the rows of the edges that do not intersect the plane and a mask of those that
+    are zero length.
+    """
+    verts, local, counts = np.unique(edges.ravel(), return_inverse=True, return_counts=True)
+    local = local.reshape(-1, 2)
+    touched = np.zeros(len(verts), dtype=bool) if on_plane is None else on_plane[verts]
+    shared = np.any((counts[local] > 1) | touched[local], axis=1)
+
+    free = np.flatnonzero(~shared)
+    moved, projected, active, hit = project_edges_on_plane(
+        co, edges[free], origin, normal, is_positive, is_closest, use_outside_edges)
+    moved = moved[active & hit]
+    projected = projected[active & hit]
+    failed_rows = free[active & ~hit]
+    failed_edges = edges[failed_rows]
+    degenerate = np.all(co[failed_edges[:, 0]] == co[failed_edges[:, 1]], axis=1)
+
+    rows = np.flatnonzero(shared)
+    if on_plane is not None:
+        on_plane[moved] = True
+    if len(rows):
+        points = co[verts].tolist()
+        written = np.zeros(len(verts), dtype=bool)
+        ox, oy, oz = origin.tolist()
+        nx, ny, nz = normal.tolist()
+        chain_failed = []
+        chain_degenerate = []
+        for row, (a, b) in zip(rows.tolist(), local[rows].tolist()):
+            pa = points[a]
+            pb = points[b]
+            dist_a = 0.0 if touched[a] else (pa[0] - ox) * nx + (pa[1] - oy) * ny + (pa[2] - oz) * nz
+            dist_b = 0.0 if touched[b] else (pb[0] - ox) * nx + (pb[1] - oy) * ny + (pb[2] - oz) * nz
+            closer_b = abs(dist_a) > abs(dist_b)
+            if is_closest:
+                move_b = closer_b
+            else:
+                same_side = dist_a > 0 and dist_b > 0 or dist_a < 0 and dist_b < 0
+                if same_side and not use_outside_edges:
+                    continue
+                move_b = closer_b if same_side else (dist_b > 0 if is_positive else dist_b < 0)
+            if move_b:
+                start, end, dist, target = pa, pb, dist_a, b
+            else:
+                start, end, dist, target = pb, pa, dist_b, a
+            dx = end[0] - start[0]
+            dy = end[1] - start[1]
+            dz = end[2] - start[2]
+            denom = dx * nx + dy * ny + dz * nz
+            if abs(denom) <= FLT_EPSILON:
+                chain_failed.append(row)
+                chain_degenerate.append(pa == pb)
+                continue
+            lam = -dist / denom
+            points[target] = [start[0] + lam * dx, start[1] + lam * dy, start[2] + lam * dz]
+            touched[target] = True
+            written[target] = True
+        if on_plane is not None:
+            on_plane[verts[written]] = True
+        moved = np.concatenate((moved, verts[written]))
+        projected = np.concatenate((projected, np.array(points, dtype=np.float64).reshape(-1, 3)[written]))
+        failed_rows = np.concatenate((failed_rows, np.array(chain_failed, dtype=np.int64)))
+        degenerate = np.concatenate((degenerate, np.array(chain_degenerate, dtype=bool)))
+
+    order = np.argsort(moved, kind="stable")
+    failed_order = np.argsort(failed_rows, kind="stable")
+    return moved[order], projected[order], failed_rows[failed_order], degenerate[failed_order]
+
+
+def view_third_point(v1, v2, view_matrix):
+    """Third plane point for a two vertex selection, taken from the view direction
+
+    Same construction SetNormalSel always used: the view location is dropped along the view
+    axis onto the plane through v2 - v1 facing the viewer.
+    """
+    view_matrix = np.array(view_matrix, dtype=np.float64)
+    view_z = view_matrix[2, :3]
+    point = np.linalg.inv(view_matrix)[:3, 3]
+    a = np.asarray(v2, dtype=np.float64) - np.asarray(v1, dtype=np.float64)
+    projected, _ = project_points_on_plane(point[None], view_z * -2, a, view_z)
+    return projected[0]
+
+
+def plane_axes_from_points(v1, v2, v3):
+    """Return the orthonormal (left, front, up) axes of the plane through three points
+
+    Left runs from v1 to v2 and up is the plane normal. Returns None if the points are colinear.
+    """
+    v1 = np.asarray(v1, dtype=np.float64)
+    a = np.asarray(v2, dtype=np.float64) - v1
+    c = np.cross(a, np.asarray(v3, dtype=np.float64) - v1)
+    length = np.linalg.norm(c)
+    if length == 0:
+        return None
+    c = c / length
+    b = np.cross(c, a)
+    return a / np.linalg.norm(a), b / np.linalg.norm(b), c
+
+
+def project_selection(co, mat, plane_co, plane_no, selection, edges=None, direction=None,
+                      is_positive=True, is_closest=False, use_outside_edges=True, edge_rule='SEQUENTIAL'):
+    """Project a selection the way the operator does, in vertex mode or in edge mode if edges is given
+
+    selection holds the indices of the selected vertices, or of the selected rows of edges in edge
+    mode. Plane and direction are in world space and moved into the object space of mat. Returns
+    the indices of the vertices to move, their projected coordinates, the indices of the selected
+    elements that do not intersect the plane and the reason for each of them: DEGENERATE for a
+    zero length edge or direction, PARALLEL otherwise. In edge mode the default 'SEQUENTIAL' rule
+    applies the edges one after another like the original loop, 'ORDER' evaluates every edge on the
+    original coordinates and lets the last edge of a shared vertex win, and 'SHORTEST' or
+    'PERPENDICULAR' pick one edge per vertex with project_edge_vertices.
+    """
+    origin, normal = plane_to_object_space(mat, plane_co, plane_no)
+
+    if edges is None:
+        direction = plane_no if direction is None else direction
+        direction = direction_to_object_space(mat, np.asarray(direction, dtype=np.float64) * 2)
+        projected, hit = project_points_on_plane(co[selection], direction, origin, normal)
+        failed = selection[~hit]
+        reason = DEGENERATE if not np.any(direction) else PARALLEL
+        return selection[hit], projected[hit], failed, np.full(len(failed), reason, dtype=np.uint8)
+
+    if edge_rule == 'SEQUENTIAL':
+        moved, projected, rows, degenerate = project_edges_sequential(
+            co, edges[selection], origin, normal, is_positive, is_closest, use_outside_edges)
+        return moved, projected, selection[rows], np.where(degenerate, DEGENERATE, PARALLEL).astype(np.uint8)
+    if edge_rule != 'ORDER':
+        moved, projected, hit, rows = project_edge_vertices(
+            co, edges[selection], origin, normal, is_positive, is_closest, use_outside_edges, edge_rule)
+        write = hit
+        failed = selection[rows[~hit]]
+    else:
+        moved, projected, active, hit = project_edges_on_plane(
+            co, edges[selection], origin, normal, is_positive, is_closest, use_outside_edges)
+        # Edges are applied in index order, so a vertex shared by several edges keeps the last result
+        write = active & hit
+        failed = selection[active & ~hit]
+    failed_edges = edges[failed]
+    degenerate = np.all(co[failed_edges[:, 0]] == co[failed_edges[:, 1]], axis=1)
+    return moved[write], projected[write], failed, np.where(degenerate, DEGENERATE, PARALLEL).astype(np.uint8)
+
+
+def moved_vertices(co, indices, projected, mat, tolerance):
+    """Drop the projected vertices that move by no more than tolerance in world space
+
+    Indices repeat in edge mode when edges are applied in index order, where the last edge of a
+    vertex wins, so only that last row is compared. Returns the indices and coordinates that
+    still need to be written and the number of skipped vertices.
+    """
+    if len(indices) > 1 and not np.all(indices[1:] > indices[:-1]):
+        _, last = np.unique(indices[::-1], return_index=True)
+        rows = len(indices) - 1 - last
+        indices = indices[rows]
+        projected = projected[rows]
+    linear = np.asarray(mat, dtype=np.float64)[:3, :3]
+    offset = (projected - co[indices]) @ linear.T
+    moved = np.einsum("ij,ij->i", offset, offset) > tolerance * tolerance
+    return indices[moved], projected[moved], len(indices) - np.count_nonzero(moved)
+
+
+def project_mask_chunked(co, mat, plane_co, plane_no, mask, chunk_size, edges=None, direction=None,
+                         is_positive=True, is_closest=False, use_outside_edges=True, edge_rule='SEQUENTIAL'):
+    """Streaming project_selection that writes the projected coordinates into co in place
+
+    mask flags the selected vertices, or the selected rows of edges in edge mode, and is walked
+    in ranges of chunk_size elements, so the temporaries never grow with the selection. The math
+    runs in the dtype of co, float32 buffers keep it in single precision. With the default
+    'SEQUENTIAL' edge rule the chunks are applied in index order on co itself, which gives the
+    same result as projecting every edge one after another. 'ORDER' reads from a full copy of
+    co, so every edge sees the original coordinates and later edges overwrite earlier ones.
+    Returns the number of written vertices, the number of chunks, the selected elements that do
+    not intersect the plane and their failure reasons.
+    """
+    dtype = co.dtype
+    origin, normal = plane_to_object_space(mat, plane_co, plane_no)
+    origin = origin.astype(dtype)
+    normal = normal.astype(dtype)
+    if edges is None:
+        direction = plane_no if direction is None else direction
+        direction = direction_to_object_space(mat, np.asarray(direction, dtype=np.float64) * 2).astype(dtype)
+        denom = direction @ normal
+        hit = abs(denom) > FLT_EPSILON
+        reason = DEGENERATE if not np.any(direction) else PARALLEL
+        source = co
+    elif edge_rule == 'SEQUENTIAL':
+        source = co
+        # Vertices earlier chunks moved onto the plane
+        on_plane = np.zeros(len(co), dtype=bool)
+    else:
+        source = co.copy()
+
+    written = 0
+    chunks = 0
+    failed = []
+    reasons = []
+    for start in range(0, len(mask), chunk_size):
+        selection = np.flatnonzero(mask[start:start + chunk_size]) + start
+        if not len(selection):
+            continue
+        chunks += 1
+        if edges is None:
+            if not hit:
+                failed.append(selection)
+                reasons.append(np.full(len(selection), reason, dtype=np.uint8))
+                continue
+            points = co[selection]
+            points -= (((points - origin) @ normal) / denom)[:, None] * direction
+            co[selection] = points
+            written += len(selection)
+        elif edge_rule == 'SEQUENTIAL':
+            moved, projected, rows, degenerate = project_edges_sequential(
+                co, edges[selection], origin, normal, is_positive, is_closest, use_outside_edges, on_plane)
+            co[moved] = projected
+            written += len(moved)
+            failed.append(selection[rows])
+            reasons.append(np.where(degenerate, DEGENERATE, PARALLEL).astype(np.uint8))
+        else:
+            moved, projected, active, edge_hit = project_edges_on_plane(
+                source, edges[selection], origin, normal, is_positive, is_closest, use_outside_edges)
+            write = active & edge_hit
+            co[moved[write]] = projected[write]
+            written += np.count_nonzero(write)
+            chunk_failed = selection[active & ~edge_hit]
+            failed_edges = edges[chunk_failed]
+            degenerate = np.all(source[failed_edges[:, 0]] == source[failed_edges[:, 1]], axis=1)
+            failed.append(chunk_failed)
+            reasons.append(np.where(degenerate, DEGENERATE, PARALLEL).astype(np.uint8))
+
+    if not failed:
+        return written, chunks, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint8)
+    return written, chunks, np.concatenate(failed), np.concatenate(reasons)
+
+
+def average_normals(normals, selection, edges, vert_count):
+    """Normals of the selected vertices averaged with the normals of their selected neighbours
+
+    normals holds one row per selected vertex, edges is the full edge table of the mesh.
+    """
+    local = np.full(vert_count, -1, dtype=np.int64)
+    local[selection] = np.arange(len(selection))
+    pairs = local[edges]
+    pairs = pairs[np.all(pairs >= 0, axis=1)]
+    # Both directions of every edge between selected vertices, summed per vertex in one pass
+    targets = np.concatenate((pairs[:, 0], pairs[:, 1]))
+    sources = np.concatenate((pairs[:, 1], pairs[:, 0]))
+    summed = normals.copy()
+    for axis in range(3):
+        summed[:, axis] += np.bincount(targets, weights=normals[sources, axis], minlength=len(selection))
+    length = np.linalg.norm(summed, axis=1)
+    return summed / np.where(length > 0, length, 1.0)[:, None]
+
+
+def project_along_normals(co, mat, plane_co, plane_no, selection, normals):
+    """Vertex mode projection along one object space normal per selected vertex
+
+    The normals are moved to world space and the directions back into object space, so vertices
+    move along their world space normals like along the single direction of project_selection.
+    Returns the same arrays as project_selection, vertices with a normal parallel to the plane fail.
+    """
+    origin, normal = plane_to_object_space(mat, plane_co, plane_no)
+    inverse = np.linalg.inv(np.array(mat, dtype=np.float64)[:3, :3])
+    directions = normals @ (inverse @ inverse.T)
+    projected, hit = project_points_on_plane(co[selection], directions, origin, normal)
+    failed = selection[~hit]
+    degenerate = ~np.any(directions[~hit], axis=1)
+    return selection[hit], projected[hit], failed, np.where(degenerate, DEGENERATE, PARALLEL).astype(np.uint8)
+
+
+def project_selection_on_planes(co, mat, plane_cos, plane_nos, sides, selection, edges=None,
+                                use_nearest=False, use_outside_edges=True):
+    """Project a selection against a stack of planes in one pass, in vertex mode or in edge mode if edges is given
+
+    sides holds 1 for planes that push back elements on their positive side and -1 for the negative
+    side. An element violates a plane when one of its vertices is on that side, and is projected onto
+    the first violated plane of the stack, or with use_nearest the one it violates the least. Vertices
+    move along the plane normal, edges slide their vertex on the violated side like project_selection.
+    Returns the same arrays as project_selection, elements that violate no plane are left out.
+    """
+    planes = [plane_to_object_space(mat, plane_co, plane_no) for plane_co, plane_no in zip(plane_cos, plane_nos)]
+    origins = np.array([origin for origin, _ in planes]).reshape(-1, 3)
+    normals = np.array([normal for _, normal in planes]).reshape(-1, 3)
+    sides = np.asarray(sides, dtype=np.float64)
+    # Vertices move along the world space normal, like in project_selection
+    directions = [direction_to_object_space(mat, np.asarray(plane_no, dtype=np.float64) * 2) for plane_no in plane_nos]
+    offsets = np.einsum("ij,ij->i", origins, normals)
+
+    if edges is None:
+        depth = (co[selection] @ normals.T - offsets) * sides
+        violated = depth > 0
+    else:
+        selected_edges = edges[selection]
+        depth_a = (co[selected_edges[:, 0]] @ normals.T - offsets) * sides
+        depth_b = (co[selected_edges[:, 1]] @ normals.T - offsets) * sides
+        depth = np.maximum(depth_a, depth_b)
+        violated = depth > 0
+        if not use_outside_edges:
+            # Edges with both vertices beyond the plane do not cross it
+            violated &= (depth_a <= 0) | (depth_b <= 0)
+
+    any_violated = violated.any(axis=1)
+    if use_nearest:
+        # depth is the world space distance scaled by the length of the world space normal
+        lengths = np.linalg.norm(np.asarray(plane_nos, dtype=np.float64).reshape(-1, 3), axis=1)
+        distance = depth / np.where(lengths > 0, lengths, 1.0)
+        choice = np.argmin(np.where(violated, distance, np.inf), axis=1)
+    else:
+        choice = np.argmax(violated, axis=1)
+
+    # Every plane projects the elements that chose it, written back in selection order
+    moved = np.empty(len(selection), dtype=np.int64)
+    projected = np.empty((len(selection), 3))
+    hit = np.zeros(len(selection), dtype=bool)
+    for index, (origin, normal) in enumerate(zip(origins, normals)):
+        rows = np.flatnonzero(any_violated & (choice == index))
+        if edges is None:
+            moved[rows] = selection[rows]
+            projected[rows], hit[rows] = project_points_on_plane(co[selection[rows]], directions[index], origin, normal)
+        else:
+            moved[rows], projected[rows], _, hit[rows] = project_edges_on_plane(
+                co, selected_edges[rows], origin, normal, sides[index] > 0, False, True)
+
+    write = any_violated & hit
+    failed = selection[any_violated & ~hit]
+    if edges is None:
+        # Only reachable through rounding, a vertex moving along the normal cannot be parallel to the plane
+        reasons = np.full(len(failed), PARALLEL, dtype=np.uint8)
+    else:
+        failed_edges = edges[failed]
+        degenerate = np.all(co[failed_edges[:, 0]] == co[failed_edges[:, 1]], axis=1)
+        reasons = np.where(degenerate, DEGENERATE, PARALLEL).astype(np.uint8)
+    return moved[write], projected[write], failed, reasons
+
+
+def count_failures(reasons):
+    """Number of failed elements per failure name"""
+    values, counts = np.unique(reasons, return_counts=True)
+    return {FAILURE_NAMES[value]: int(count) for value, count in zip(values.tolist(), counts.tolist())}
+
+
+def fit_plane(points):
+    """Least squares plane through any number of points, from the eigenvectors of their covariance
+
+    Returns the centroid, the orthonormal (left, front, up) axes and the RMS and largest distance
+    of the points to the plane, or None if the points are colinear. Left runs along the largest
+    spread and up is the plane normal. The signs follow plane_axes_from_points on the first
+    points, so three points give the same normal in both.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    centroid = points.mean(axis=0)
+    centered = points - centroid
+    values, vectors = np.linalg.eigh(centered.T @ centered)
+    if values[1] <= values[2] * FLT_EPSILON:
+        return None
+
+    left = vectors[:, 2]
+    up = vectors[:, 0]
+    if np.dot(left, points[1] - points[0]) < 0:
+        left = -left
+    if np.dot(up, np.cross(points[1] - points[0], points[2] - points[0])) < 0:
+        up = -up
+    front = np.cross(up, left)
+
+    distances = np.abs(centered @ up)
+    return centroid, (left, front, up), np.sqrt(np.mean(distances ** 2)), distances.max()
@@ -0,0 +1,376 @@
+"""Per-object cache of edit mesh arrays
+
+Reading a big edit mesh into arrays is the expensive part of every projection, so the draw
+handler keeps one snapshot per object between redraws. Snapshots are dropped by the depsgraph
+handler when the mesh or object changes and by the operators after they write. The depsgraph
+handler does not run between operators called back to back from a script, so operators always
+read the mesh again and leave that snapshot in the cache for the next redraw.
+
+The projection operator also keeps the snapshot it projected from. Undoing the projection, which
+the redo panel does before running it again, brings the mesh back to exactly that state, so the
+redo reuses those arrays instead of reading the mesh again.
+"""
+import itertools
+
+import bpy
+import bmesh
+import numpy as np
+from mathutils.kdtree import KDTree
+
+# Values converted per step when coordinates change precision inside their own buffer
+CONVERT_CHUNK = 1 << 16
+
+
+def read_bmesh_verts(bm):
+    """Return object space coordinates (N, 3) and selection flags (N,) of all bmesh vertices"""
+    count = len(bm.verts)
+    co = np.fromiter(itertools.chain.from_iterable(v.co for v in bm.verts), dtype=np.float64, count=count * 3)
+    sel = np.fromiter((v.select for v in bm.verts), dtype=bool, count=count)
+    return co.reshape(count, 3), sel
+
+
+def read_bmesh_edges(bm):
+    """Return the (E, 2) vertex index table and selection flags (E,) of all bmesh edges"""
+    bm.verts.index_update()
+    bm.edges.index_update()
+    count = len(bm.edges)
+    edges = np.fromiter(itertools.chain.from_iterable((e.verts[0].index, e.verts[1].index) for e in bm.edges), dtype=np.int64, count=count * 2)
+    sel = np.fromiter((e.select for e in bm.edges), dtype=bool, count=count)
+    return edges.reshape(count, 2), sel
+
+
+def read_bmesh_normals(bm, indices):
+    """Return the object space normals (N, 3) of the bmesh vertices with the given indices"""
+    bm.verts.ensure_lookup_table()
+    verts = bm.verts
+    normals = np.fromiter(
+        itertools.chain.from_iterable(verts[index].normal for index in indices.tolist()), dtype=np.float64, count=len(indices) * 3)
+    return normals.reshape(len(indices), 3)
+
+
+def write_bmesh_verts(bm, indices, co):
+    """Write coordinates back to the bmesh vertices with the given indices"""
+    bm.verts.ensure_lookup_table()
+    verts = bm.verts
+    for index, vert_co in zip(indices.tolist(), co.tolist()):
+        verts[index].co = vert_co
+
+
+def select_bmesh_elements(bm, vert_indices, edge_indices=None):
+    """Replace the selection with the given vertices, or edges if given"""
+    for elements in (bm.verts, bm.edges, bm.faces):
+        for element in elements:
+            element.select = False
+    if edge_indices is None:
+        bm.verts.ensure_lookup_table()
+        for index in vert_indices.tolist():
+            bm.verts[index].select = True
+    else:
+        bm.edges.ensure_lookup_table()
+        for index in edge_indices.tolist():
+            bm.edges[index].select_set(True)
+    bm.select_flush_mode()
+
+
+def set_bmesh_vertex_group(obj, bm, name, indices):
+    """Replace the members of the named vertex group with the given vertices, creating it if needed"""
+    group = obj.vertex_groups.get(name)
+    if group is not None:
+        obj.vertex_groups.remove(group)
+    group = obj.vertex_groups.new(name=name)
+    deform = bm.verts.layers.deform.verify()
+    bm.verts.ensure_lookup_table()
+    for index in indices.tolist():
+        bm.verts[index][deform][group.index] = 1.0
+
+
+def weld_bmesh_verts(bm, indices, dist):
+    """Merge the given vertices that are within dist of another one of them, returns the number of removed vertices
+
+    A KD-tree over just these vertices finds the ones with a close neighbour, so remove_doubles
+    never looks at the rest of the mesh.
+    """
+    indices = np.unique(indices)
+    if len(indices) < 2:
+        return 0
+    bm.verts.ensure_lookup_table()
+    verts = [bm.verts[index] for index in indices.tolist()]
+    tree = KDTree(len(verts))
+    for index, vert in enumerate(verts):
+        tree.insert(vert.co, index)
+    tree.balance()
+    close = [vert for vert in verts if len(tree.find_range(vert.co, dist)) > 1]
+    if not close:
+        return 0
+    count = len(bm.verts)
+    bmesh.ops.remove_doubles(bm, verts=close, dist=dist)
+    return count - len(bm.verts)
+
+
+def read_mesh_verts(mesh, dtype=np.float64):
+    """Object mode counterpart of read_bmesh_verts, reads the mesh data with foreach_get
+
+    float32 returns the foreach_get buffer itself without a double precision copy, float64
+    widens it inside the double precision buffer, so only one coordinate array is allocated.
+    """
+    sel = np.empty(len(mesh.vertices), dtype=bool)
+    mesh.vertices.foreach_get("select", sel)
+    return read_co(mesh.vertices, dtype), sel
+
+
+def read_co(data, dtype=np.float64):
+    """Coordinates (N, 3) of a vertex or shape key point collection, read with foreach_get"""
+    count = len(data)
+    if np.dtype(dtype) == np.float32:
+        # Buffers match the mesh data types so foreach_get can copy them directly
+        co = np.empty(count * 3, dtype=np.float32)
+        data.foreach_get("co", co)
+    else:
+        co = np.empty(count * 3, dtype=np.float64)
+        # The float32 values go to the upper half of the buffer, widening them from the front
+        # only overwrites values that were already converted
+        raw = co.view(np.float32)[count * 3:]
+        data.foreach_get("co", raw)
+        for start in range(0, len(co), CONVERT_CHUNK):
+            co[start:start + CONVERT_CHUNK] = raw[start:start + CONVERT_CHUNK]
+    return co.reshape(count, 3)
+
+
+def narrow_to_float32(co):
+    """Convert contiguous float64 coordinates to float32 inside their own buffer
+
+    Returns a float32 view of the first half of the buffer, co must not be used afterwards.
+    """
+    if not co.flags.c_contiguous:
+        return co.astype(np.float32)
+    flat = co.reshape(-1)
+    out = flat.view(np.float32)[:len(flat)]
+    # Every chunk only overwrites values that were already converted
+    for start in range(0, len(flat), CONVERT_CHUNK):
+        out[start:start + CONVERT_CHUNK] = flat[start:start + CONVERT_CHUNK]
+    return out.reshape(co.shape)
+
+
+def read_mesh_normals(mesh):
+    """Object space vertex normals (N, 3) of the mesh data, read with foreach_get"""
+    normals = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("normal", normals)
+    return normals.reshape(-1, 3).astype(np.float64)
+
+
+def read_mesh_edges(mesh, dtype=np.int64):
+    """Object mode counterpart of read_bmesh_edges, reads the mesh data with foreach_get"""
+    count = len(mesh.edges)
+    edges = np.empty(count * 2, dtype=np.int32)
+    sel = np.empty(count, dtype=bool)
+    mesh.edges.foreach_get("vertices", edges)
+    mesh.edges.foreach_get("select", sel)
+    return edges.reshape(count, 2).astype(dtype, copy=False), sel
+
+
+def write_mesh_verts(mesh, co):
+    """Write all vertex coordinates of the mesh data with foreach_set"""
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(co, dtype=np.float32).ravel())
+    mesh.update()
+
+
+def read_shape_key(key_block, dtype=np.float64):
+    """Coordinates (N, 3) of one shape key, read with foreach_get"""
+    return read_co(key_block.data, dtype)
+
+
+def write_shape_key(key_block, co):
+    key_block.data.foreach_set("co", np.ascontiguousarray(co, dtype=np.float32).ravel())
+
+
+def select_mesh_elements(mesh, vert_indices, edge_indices=None):
+    """Object mode counterpart of select_bmesh_elements, sets the selection flags with foreach_set"""
+    edges, _ = read_mesh_edges(mesh)
+    vert_sel = np.zeros(len(mesh.vertices), dtype=bool)
+    if edge_indices is None:
+        vert_sel[vert_indices] = True
+        edge_sel = vert_sel[edges[:, 0]] & vert_sel[edges[:, 1]]
+    else:
+        edge_sel = np.zeros(len(edges), dtype=bool)
+        edge_sel[edge_indices] = True
+        vert_sel[edges[edge_indices].ravel()] = True
+
+    # A face is selected when all of its vertices are
+    loop_start = np.empty(len(mesh.polygons), dtype=np.int32)
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    face_sel = np.logical_and.reduceat(vert_sel[loop_verts], loop_start) if len(loop_start) else np.zeros(0, dtype=bool)
+
+    mesh.vertices.foreach_set("select", vert_sel)
+    mesh.edges.foreach_set("select", edge_sel)
+    mesh.polygons.foreach_set("select", face_sel)
+
+
+def set_mesh_vertex_group(obj, name, indices):
+    """Object mode counterpart of set_bmesh_vertex_group"""
+    group = obj.vertex_groups.get(name)
+    if group is not None:
+        obj.vertex_groups.remove(group)
+    obj.vertex_groups.new(name=name).add(indices.tolist(), 1.0, 'REPLACE')
+
+
+def vertex_group_mask(obj, name):
+    """Mask of the vertices with a weight in the named vertex group, None if the group does not exist
+
+    Vertex group weights have no bulk accessor, so this walks the vertices once.
+    """
+    group = obj.vertex_groups.get(name)
+    if group is None:
+        return None
+    index = group.index
+    vertices = obj.data.vertices
+    return np.fromiter(
+        (any(g.group == index and g.weight > 0 for g in v.groups) for v in vertices), dtype=bool, count=len(vertices))
+
+
+class MeshSnapshot:
+    """Coordinates, selection and edge table of one edit mesh"""
+
+    def __init__(self, mesh_name, bm):
+        self.mesh_name = mesh_name
+        self.vert_count = len(bm.verts)
+        self.edge_count = len(bm.edges)
+        self.co, self.sel = read_bmesh_verts(bm)
+        self.edges = None
+        self.edge_sel = None
+        self._world_co = None
+        self._world_key = None
+
+    @classmethod
+    def from_mesh(cls, mesh, edges=False):
+        """Snapshot of the mesh data of an object in object mode, read with foreach_get"""
+        self = cls.__new__(cls)
+        self.mesh_name = mesh.name_full
+        self.vert_count = len(mesh.vertices)
+        self.edge_count = len(mesh.edges)
+        self.co, self.sel = read_mesh_verts(mesh)
+        self.edges, self.edge_sel = read_mesh_edges(mesh) if edges else (None, None)
+        self._world_co = None
+        self._world_key = None
+        return self
+
+    def read_edges(self, bm):
+        if self.edges is None:
+            self.edges, self.edge_sel = read_bmesh_edges(bm)
+
+    def world_co(self, mat):
+        """World space coordinates for the given object matrix, cached until the matrix changes"""
+        key = tuple(v for row in mat for v in row)
+        if self._world_co is None or key != self._world_key:
+            mat = np.array(mat, dtype=np.float64)
+            self._world_co = self.co @ mat[:3, :3].T + mat[:3, 3]
+            self._world_key = key
+        return self._world_co
+
+    def same_data(self, other):
+        """Whether both snapshots hold the same coordinates, selection and edges"""
+        if other is self:
+            return True
+        if other.vert_count != self.vert_count or other.edge_count != self.edge_count:
+            return False
+        if not (np.array_equal(other.co, self.co) and np.array_equal(other.sel, self.sel)):
+            return False
+        if self.edges is None:
+            return True
+        return (other.edges is not None and np.array_equal(other.edges, self.edges)
+                and np.array_equal(other.edge_sel, self.edge_sel))
+
+    def matches(self, mesh_name, bm):
+        return mesh_name == self.mesh_name and len(bm.verts) == self.vert_count and len(bm.edges) == self.edge_count
+
+
+class Originals:
+    """Snapshot an object was projected from and the plane it was projected onto"""
+
+    def __init__(self, key, mesh_snapshot, selection):
+        self.key = key
+        self.snapshot = mesh_snapshot
+        self.selection = selection
+        # Set by the first undo after the projection, the mesh holds these coordinates again
+        self.restored = False
+
+
+# Snapshots by object name
+snapshots = {}
+# Originals of the last projection by object name
+originals = {}
+# The next mesh update comes from the projection or undo that set this and keeps the originals
+expect_update = False
+
+
+def get_snapshot(obj, bm=None, edges=False, fresh=False):
+    """Return the cached snapshot of an object in edit mode, reading the mesh only if needed or fresh is set"""
+    if bm is None:
+        bm = bmesh.from_edit_mesh(obj.data)
+    snapshot = snapshots.get(obj.name_full)
+    if fresh or snapshot is None or not snapshot.matches(obj.data.name_full, bm):
+        snapshot = MeshSnapshot(obj.data.name_full, bm)
+        snapshots[obj.name_full] = snapshot
+    if edges:
+        snapshot.read_edges(bm)
+    return snapshot
+
+
+def invalidate(obj=None):
+    """Drop the snapshot of one object, or all of them"""
+    if obj is None:
+        snapshots.clear()
+    else:
+        snapshots.pop(obj.name_full, None)
+
+
+def store_originals(obj, key, mesh_snapshot, selection):
+    """Keep the snapshot an object is about to be projected from"""
+    global expect_update
+    originals[obj.name_full] = Originals(key, mesh_snapshot, selection)
+    expect_update = True
+
+
+def get_originals(obj, key, bm):
+    """Originals of the last projection if an undo restored them and the plane is the same"""
+    entry = originals.get(obj.name_full)
+    if entry is None or not entry.restored or entry.key != key or not entry.snapshot.matches(obj.data.name_full, bm):
+        return None
+    return entry
+
+
+def undo_originals():
+    """The first undo after a projection restores its originals, any further undo goes past them"""
+    global expect_update
+    for name, entry in list(originals.items()):
+        if entry.restored:
+            del originals[name]
+        else:
+            entry.restored = True
+    expect_update = True
+
+
+def update_from_depsgraph(depsgraph):
+    """Drop snapshots touched by a depsgraph update, returns True if anything was dropped"""
+    global expect_update
+    changed = False
+    own_update = expect_update
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Mesh):
+            name = update.id.original.name_full
+            for key in [key for key, snapshot in snapshots.items() if snapshot.mesh_name == name]:
+                del snapshots[key]
+            if own_update:
+                expect_update = False
+            else:
+                # Any other edit changes the mesh the originals would be restored into
+                for key in [key for key, entry in originals.items() if entry.snapshot.mesh_name == name]:
+                    del originals[key]
+            changed = True
+        elif isinstance(update.id, bpy.types.Object):
+            # Transforms only change world space data, which is keyed on the matrix
+            if update.is_updated_geometry:
+                snapshots.pop(update.id.original.name_full, None)
+            changed = True
+    return changed
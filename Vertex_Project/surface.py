@@ -0,0 +1,96 @@
+"""Projection onto the surface of another mesh object
+
+Ray casts go through a mathutils.bvhtree built from the evaluated target mesh in world space.
+Building it is by far the most expensive step on big targets, so trees are cached per object
+and dropped only when the depsgraph reports a geometry change or the object matrix differs.
+"""
+import bpy
+import numpy as np
+from mathutils import Vector
+from mathutils.bvhtree import BVHTree
+
+
+class SurfaceTree:
+    """World space BVH tree of one target object and the matrix it was built with"""
+
+    def __init__(self, obj, depsgraph):
+        self.matrix_key = tuple(v for row in obj.matrix_world for v in row)
+        obj_eval = obj.evaluated_get(depsgraph)
+        mesh = obj_eval.to_mesh()
+        try:
+            mesh.calc_loop_triangles()
+            co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+            triangles = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+            mesh.vertices.foreach_get("co", co)
+            mesh.loop_triangles.foreach_get("vertices", triangles)
+        finally:
+            obj_eval.to_mesh_clear()
+
+        mat = np.array(obj.matrix_world, dtype=np.float64)
+        co = co.reshape(-1, 3) @ mat[:3, :3].T + mat[:3, 3]
+        self.triangle_count = len(triangles) // 3
+        self.tree = BVHTree.FromPolygons(co.tolist(), triangles.reshape(-1, 3).tolist(), all_triangles=True)
+
+
+# Trees by object name
+trees = {}
+
+
+def get_tree(obj, depsgraph):
+    """Return the cached tree of a target object, building it only if needed"""
+    tree = trees.get(obj.name_full)
+    if tree is None or tree.matrix_key != tuple(v for row in obj.matrix_world for v in row):
+        tree = SurfaceTree(obj, depsgraph)
+        trees[obj.name_full] = tree
+    return tree
+
+
+def invalidate(obj=None):
+    """Drop the tree of one object, or all of them"""
+    if obj is None:
+        trees.clear()
+    else:
+        trees.pop(obj.name_full, None)
+
+
+def update_from_depsgraph(depsgraph):
+    """Drop the trees of objects whose evaluated geometry changed"""
+    if not trees:
+        return
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Object) and update.is_updated_geometry:
+            trees.pop(update.id.original.name_full, None)
+
+
+def project_on_surface(tree, co, direction, use_nearest=True):
+    """Cast a ray from every world space point along direction and its opposite, keeping the closer hit
+
+    direction is one vector for all points or one per point. Points without a hit move to the
+    nearest point of the surface if use_nearest is set. Returns the projected points and a mask of
+    the points that were projected.
+    """
+    co = np.asarray(co, dtype=np.float64)
+    direction = np.broadcast_to(np.asarray(direction, dtype=np.float64), co.shape)
+    projected = co.copy()
+    hit = np.zeros(len(co), dtype=bool)
+
+    # BVHTree has no batched queries, so this is one Python call per ray
+    ray_cast = tree.tree.ray_cast
+    find_nearest = tree.tree.find_nearest
+    for index, (point, ray) in enumerate(zip(co.tolist(), direction.tolist())):
+        point = Vector(point)
+        ray = Vector(ray)
+        location = None
+        if ray.length_squared > 0:
+            forward = ray_cast(point, ray)
+            backward = ray_cast(point, -ray)
+            if forward[0] is not None and (backward[0] is None or forward[3] <= backward[3]):
+                location = forward[0]
+            elif backward[0] is not None:
+                location = backward[0]
+        if location is None and use_nearest:
+            location = find_nearest(point)[0]
+        if location is not None:
+            projected[index] = location
+            hit[index] = True
+    return projected, hit
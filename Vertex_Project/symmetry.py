@@ -0,0 +1,70 @@
+"""Mirror lookup for projecting both halves of a symmetric mesh
+
+Mirror vertices are found with a mathutils.kdtree over all vertices of the mesh, built once per
+projection. Mirroring happens in object space across the plane normal to the chosen axis, the
+same symmetry the mesh edit mode mirror options use.
+"""
+import numpy as np
+from mathutils.kdtree import KDTree
+
+AXES = {'X': 0, 'Y': 1, 'Z': 2}
+
+
+def mirror_matrix(axis):
+    """4x4 matrix mirroring object space across the plane normal to axis"""
+    mat = np.eye(4)
+    mat[AXES[axis], AXES[axis]] = -1.0
+    return mat
+
+
+def build_tree(co):
+    tree = KDTree(len(co))
+    for index, vert_co in enumerate(co.tolist()):
+        tree.insert(vert_co, index)
+    tree.balance()
+    return tree
+
+
+def find_mirrors(tree, co, indices, axis, tolerance):
+    """Index of the mirror vertex of each given vertex, -1 where none is within tolerance
+
+    KDTree has no batched query, so all lookups run in one loop collected straight into an array.
+    """
+    query = co[indices].copy()
+    query[:, AXES[axis]] *= -1.0
+    find = tree.find
+    return np.fromiter(
+        (index if index is not None and distance <= tolerance else -1 for _, index, distance in map(find, query.tolist())),
+        dtype=np.int64, count=len(indices))
+
+
+def find_edges(edges, vert_count, pairs):
+    """Index of the edge between every pair of vertices, -1 where there is none"""
+    if not len(pairs):
+        return np.empty(0, dtype=np.int64)
+    keys = np.minimum(edges[:, 0], edges[:, 1]) * vert_count + np.maximum(edges[:, 0], edges[:, 1])
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    query = np.minimum(pairs[:, 0], pairs[:, 1]) * vert_count + np.maximum(pairs[:, 0], pairs[:, 1])
+    position = np.minimum(np.searchsorted(sorted_keys, query), len(keys) - 1)
+    found = (sorted_keys[position] == query) & np.all(pairs >= 0, axis=1)
+    return np.where(found, order[position], -1)
+
+
+def mirror_selection(co, sel, selection, axis, tolerance, edges=None, edge_sel=None):
+    """Mirror counterparts of the selected vertices, or of the selected edges if edges is given
+
+    Counterparts that are selected themselves are left out, the projection already moves them.
+    """
+    tree = build_tree(co)
+    if edges is None:
+        mirrors = find_mirrors(tree, co, selection, axis, tolerance)
+        mirrors = mirrors[mirrors >= 0]
+        return np.unique(mirrors[~sel[mirrors]])
+
+    verts = np.unique(edges[selection])
+    mirrors = np.full(len(co), -1, dtype=np.int64)
+    mirrors[verts] = find_mirrors(tree, co, verts, axis, tolerance)
+    mirrored_edges = find_edges(edges, len(co), mirrors[edges[selection]])
+    mirrored_edges = mirrored_edges[mirrored_edges >= 0]
+    return np.unique(mirrored_edges[~edge_sel[mirrored_edges]])
@@ -0,0 +1,190 @@
+"""Scaling benchmark for the headless projection core
+
+Runs the vertex, edge and closest projection modes on synthetic data without Blender and
+reports throughput and peak memory for every size:
+
+    python benchmarks/bench_projection.py
+    python benchmarks/bench_projection.py --sizes 10000 100000 --json results.json
+    python benchmarks/bench_projection.py --compare results.json --tolerance 0.2
+
+Vertex mode runs on a flat grid lifted by noise, edge and closest mode on a random edge soup.
+The sequential and order cases run the edge rules of the operator on the edges of the grid,
+where connected edges move shared vertices one after another.
+With --compare the run fails when a case gets slower than the stored result by more than the
+tolerance, so it can be used as a regression gate before a release.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+# Load projection.py directly, the package __init__ needs bpy
+_PROJECTION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Vertex_Project", "projection.py")
+_spec = importlib.util.spec_from_file_location("vertex_projection_core", _PROJECTION_PATH)
+projection = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(projection)
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000, 5_000_000)
+
+# Slightly rotated and scaled object matrix, so the object space plane transform is exercised
+MATRIX = np.array((
+    (0.9, -0.1, 0.0, 1.0),
+    (0.1, 0.9, 0.2, -2.0),
+    (0.0, -0.2, 1.1, 0.5),
+    (0.0, 0.0, 0.0, 1.0),
+))
+PLANE_CO = np.array((0.3, -0.2, 0.1))
+PLANE_NO = np.array((0.2, 0.3, 0.93))
+CHUNK_SIZE = 262144
+
+
+def make_grid(count, rng):
+    """Flat grid of about count vertices with some noise along Z"""
+    side = int(np.ceil(np.sqrt(count)))
+    x, y = np.meshgrid(np.linspace(-10, 10, side), np.linspace(-10, 10, side))
+    co = np.empty((side * side, 3))
+    co[:, 0] = x.ravel()
+    co[:, 1] = y.ravel()
+    co[:, 2] = rng.normal(0.0, 2.0, side * side)
+    return co[:count]
+
+
+def make_mesh(count, rng):
+    """make_grid with the edges between neighbouring vertices, rows first like a grid primitive"""
+    co = make_grid(count, rng)
+    side = int(np.ceil(np.sqrt(count)))
+    index = np.arange(side * side).reshape(side, side)
+    edges = np.concatenate((
+        np.column_stack((index[:, :-1].ravel(), index[:, 1:].ravel())),
+        np.column_stack((index[:-1].ravel(), index[1:].ravel())),
+    ))
+    return co, edges[np.all(edges < count, axis=1)]
+
+
+def make_edge_soup(count, rng):
+    """count random edges over count random vertices"""
+    co = rng.uniform(-10.0, 10.0, (count, 3))
+    edges = rng.integers(0, count, (count, 2))
+    return co, edges
+
+
+def run_vertices(co, edges):
+    origin, normal = projection.plane_to_object_space(MATRIX, PLANE_CO, PLANE_NO)
+    direction = projection.direction_to_object_space(MATRIX, PLANE_NO * 2)
+    projection.project_points_on_plane(co, direction, origin, normal)
+
+
+def run_edges(co, edges):
+    origin, normal = projection.plane_to_object_space(MATRIX, PLANE_CO, PLANE_NO)
+    projection.project_edges_on_plane(co, edges, origin, normal, True, False, True)
+
+
+def run_closest(co, edges):
+    origin, normal = projection.plane_to_object_space(MATRIX, PLANE_CO, PLANE_NO)
+    projection.project_edges_on_plane(co, edges, origin, normal, True, True, True)
+
+
+def run_rule(co, edges, rule):
+    """Edge mode through project_selection, the way the operator runs it"""
+    projection.project_selection(co, MATRIX, PLANE_CO, PLANE_NO, np.arange(len(edges)), edges=edges, edge_rule=rule)
+
+
+def run_stream(co, edges, dtype, rule='ORDER'):
+    """Streaming mode including its write buffer, which the batched cases leave to the caller"""
+    mask = np.ones(len(edges) if edges is not None else len(co), dtype=bool)
+    projection.project_mask_chunked(co.astype(dtype), MATRIX, PLANE_CO, PLANE_NO, mask, CHUNK_SIZE, edges=edges, edge_rule=rule)
+
+
+CASES = (
+    ("vertices", "grid", run_vertices),
+    ("edges", "soup", run_edges),
+    ("closest", "soup", run_closest),
+    ("stream32", "grid", lambda co, edges: run_stream(co, edges, np.float32)),
+    ("stream64", "grid", lambda co, edges: run_stream(co, edges, np.float64)),
+    ("edges32", "soup", lambda co, edges: run_stream(co, edges, np.float32)),
+    ("sequential", "mesh", lambda co, edges: run_rule(co, edges, 'SEQUENTIAL')),
+    ("order", "mesh", lambda co, edges: run_rule(co, edges, 'ORDER')),
+    ("seq32", "mesh", lambda co, edges: run_stream(co, edges, np.float32, 'SEQUENTIAL')),
+)
+
+
+def measure(func, co, edges, repeat):
+    """Best wall time over repeat runs and peak traced memory of one run"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(co, edges)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(co, edges)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def run(sizes, repeat, seed):
+    rng = np.random.default_rng(seed)
+    results = []
+    for size in sizes:
+        grid = make_grid(size, rng)
+        soup = make_edge_soup(size, rng)
+        mesh = make_mesh(size, rng)
+        for name, data, func in CASES:
+            co, edges = {"grid": (grid, None), "soup": soup, "mesh": mesh}[data]
+            seconds, peak = measure(func, co, edges, repeat)
+            results.append({
+                "case": name,
+                "size": size,
+                "seconds": seconds,
+                "elements_per_second": size / seconds,
+                "peak_mb": peak / 2 ** 20,
+            })
+            print(f"{name:>10} {size:>10,} {seconds * 1000:10.2f} ms {size / seconds / 1e6:8.2f} M/s {peak / 2 ** 20:10.1f} MB")
+    return results
+
+
+def compare(results, baseline_path, tolerance):
+    """Return the cases that got slower than the baseline by more than tolerance"""
+    with open(baseline_path) as file:
+        baseline = {(r["case"], r["size"]): r for r in json.load(file)}
+    regressions = []
+    for result in results:
+        old = baseline.get((result["case"], result["size"]))
+        if old and result["seconds"] > old["seconds"] * (1.0 + tolerance):
+            regressions.append((result, old))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Element counts to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case, the best one is reported")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--compare", help="Fail if slower than the results stored in this file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown for --compare")
+    args = parser.parse_args(argv)
+
+    print(f"{'case':>10} {'size':>10} {'time':>13} {'throughput':>12} {'peak memory':>13}")
+    results = run(args.sizes, args.repeat, args.seed)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for result, old in regressions:
+            print(f"REGRESSION {result['case']} {result['size']:,}: {old['seconds'] * 1000:.2f} ms -> {result['seconds'] * 1000:.2f} ms")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
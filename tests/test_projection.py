@@ -0,0 +1,531 @@
+"""Regression tests of the headless projection core against the original operator loops
+
+The reference functions below are plain Python ports of what ExecuteProjection and SetNormalSel
+did before the math moved to NumPy: every selected vertex or edge goes through
+intersect_line_plane on the live coordinates, one after another. They run on exact fractions,
+so a vertex an earlier edge moved lies exactly on the plane and rounding never picks the side
+of the next edge through it. Run with:
+
+    python -m pytest tests
+"""
+import importlib.util
+import os
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+# Load projection.py directly, the package __init__ needs bpy
+_PROJECTION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Vertex_Project", "projection.py")
+_spec = importlib.util.spec_from_file_location("vertex_projection_core", _PROJECTION_PATH)
+projection = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(projection)
+
+TOLERANCE = 1e-9
+
+# Slightly rotated and scaled object matrix, so the object space plane transform is exercised
+MATRIX = (
+    (1.0, 0.2, 0.0, 0.3),
+    (0.0, 1.1, 0.0, 0.0),
+    (0.1, 0.0, 0.9, 0.1),
+    (0.0, 0.0, 0.0, 1.0),
+)
+PLANE_CO = (0.1, 0.2, 0.05)
+PLANE_NO = (0.1, 0.05, 1.0)
+
+SIDES = (
+    dict(is_positive=True, is_closest=False, use_outside_edges=True),
+    dict(is_positive=False, is_closest=False, use_outside_edges=True),
+    dict(is_positive=True, is_closest=True, use_outside_edges=True),
+    dict(is_positive=True, is_closest=False, use_outside_edges=False),
+)
+
+
+def sub(a, b):
+    return [x - y for x, y in zip(a, b)]
+
+
+def dot(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+def transform(mat, v):
+    return [row[0] * v[0] + row[1] * v[1] + row[2] * v[2] + row[3] for row in mat[:3]]
+
+
+def inverted(mat):
+    """Gauss-Jordan inverse of a 4x4 matrix of fractions"""
+    rows = [list(row) + [Fraction(int(i == j)) for j in range(4)] for i, row in enumerate(mat)]
+    for col in range(4):
+        pivot = next(row for row in range(col, 4) if rows[row][col] != 0)
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        rows[col] = [x / rows[col][col] for x in rows[col]]
+        for row in range(4):
+            if row != col and rows[row][col] != 0:
+                factor = rows[row][col]
+                rows[row] = [x - factor * y for x, y in zip(rows[row], rows[col])]
+    return [row[4:] for row in rows]
+
+
+def intersect_line_plane(l1, l2, plane_co, plane_no):
+    """mathutils.geometry.intersect_line_plane, None for lines parallel to the plane"""
+    u = sub(l2, l1)
+    d = dot(plane_no, u)
+    if abs(d) <= projection.FLT_EPSILON:
+        return None
+    lam = -dot(plane_no, sub(l1, plane_co)) / d
+    return [a + b * lam for a, b in zip(l1, u)]
+
+
+def exact(values):
+    return [[Fraction(x) for x in row] for row in np.asarray(values).tolist()]
+
+
+def reference_vertices(co, selection, mat, plane_co, plane_no, direction):
+    """The vertex mode loop, returns the new coordinates and the vertices that do not intersect"""
+    mat = exact(mat)
+    to_object = inverted(mat)
+    plane_co = [Fraction(x) for x in plane_co]
+    plane_no = [Fraction(x) for x in plane_no]
+    direction = [Fraction(x) * 2 for x in direction]
+    co = exact(co)
+    failed = []
+    for index in selection:
+        start = transform(mat, co[index])
+        hit = intersect_line_plane(start, [a + b for a, b in zip(start, direction)], plane_co, plane_no)
+        if hit is None:
+            failed.append(index)
+        else:
+            co[index] = transform(to_object, hit)
+    return np.array(co, dtype=np.float64), failed
+
+
+def reference_edges(co, edges, selection, mat, plane_co, plane_no, is_positive, is_closest, use_outside_edges):
+    """The edge mode loop, returns the new coordinates and the edges that do not intersect"""
+    mat = exact(mat)
+    to_object = inverted(mat)
+    plane_co = [Fraction(x) for x in plane_co]
+    plane_no = [Fraction(x) for x in plane_no]
+    co = exact(co)
+    failed = []
+
+    def move(index, l1, l2, edge):
+        hit = intersect_line_plane(l1, l2, plane_co, plane_no)
+        if hit is None:
+            failed.append(edge)
+        else:
+            co[index] = transform(to_object, hit)
+
+    for edge in selection:
+        a, b = edges[edge]
+        v1 = transform(mat, co[a])
+        v2 = transform(mat, co[b])
+        side2 = dot(sub(plane_co, v2), plane_no)
+        side1 = dot(sub(plane_co, v1), plane_no)
+        if (side2 < 0 and side1 < 0) or (side1 > 0 and side2 > 0) or is_closest:
+            if not use_outside_edges and not is_closest:
+                continue
+            if abs(side1) > abs(side2):
+                move(b, v1, v2, edge)
+            else:
+                move(a, v2, v1, edge)
+        elif is_positive and side2 < 0 or not is_positive and side2 > 0:
+            move(b, v1, v2, edge)
+        else:
+            move(a, v2, v1, edge)
+    return np.array(co, dtype=np.float64), failed
+
+
+def reference_plane_normal(v1, v2, v3):
+    """Normal SetNormalSel set from three selected vertices"""
+    v1, v2, v3 = ([Fraction(x) for x in v] for v in (v1, v2, v3))
+    a = sub(v2, v1)
+    b = sub(v3, v1)
+    c = [a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]]
+    return np.array(c, dtype=np.float64) / np.linalg.norm(np.array(c, dtype=np.float64))
+
+
+def make_grid(side, rng):
+    """Noisy vertical grid crossing the plane, with its edges in random order"""
+    x, z = np.meshgrid(np.arange(side), np.arange(side))
+    co = np.column_stack((x.ravel(), rng.normal(0.0, 0.3, side * side), z.ravel() - (side - 1) / 2))
+    index = np.arange(side * side).reshape(side, side)
+    edges = np.concatenate((
+        np.column_stack((index[:, :-1].ravel(), index[:, 1:].ravel())),
+        np.column_stack((index[:-1].ravel(), index[1:].ravel())),
+    ))
+    return co, edges[rng.permutation(len(edges))]
+
+
+def make_disjoint_edges(count, rng):
+    """count edges that share no vertex, so every vertex is moved by at most one edge"""
+    co = rng.uniform(-5.0, 5.0, (count * 2, 3))
+    return co, rng.permutation(count * 2).reshape(count, 2)
+
+
+def apply(co, indices, projected):
+    result = co.copy()
+    result[indices] = projected
+    return result
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("use_direction", (False, True))
+def test_project_selection_vertices(seed, use_direction):
+    rng = np.random.default_rng(seed)
+    co = rng.uniform(-5.0, 5.0, (200, 3))
+    selection = np.flatnonzero(rng.random(len(co)) < 0.7)
+    direction = (0.3, -0.2, 1.0) if use_direction else PLANE_NO
+
+    expected, failed = reference_vertices(co, selection.tolist(), MATRIX, PLANE_CO, PLANE_NO, direction)
+    indices, projected, result_failed, _ = projection.project_selection(
+        co, MATRIX, PLANE_CO, PLANE_NO, selection, direction=direction if use_direction else None)
+
+    assert np.allclose(apply(co, indices, projected), expected, rtol=0.0, atol=TOLERANCE)
+    assert result_failed.tolist() == failed
+
+
+def test_project_selection_vertices_parallel():
+    co = np.random.default_rng(0).uniform(-5.0, 5.0, (10, 3))
+    direction = (1.0, -2.0, 0.0)
+    no = np.cross(direction, (0.0, 0.0, 1.0))
+
+    _, failed = reference_vertices(co, list(range(10)), np.eye(4), PLANE_CO, no, direction)
+    indices, _, result_failed, reasons = projection.project_selection(
+        co, np.eye(4), PLANE_CO, no, np.arange(10), direction=direction)
+
+    assert failed == list(range(10))
+    assert len(indices) == 0
+    assert result_failed.tolist() == failed
+    assert np.all(reasons == projection.PARALLEL)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("side", SIDES)
+def test_project_selection_edges(seed, side):
+    rng = np.random.default_rng(seed)
+    co, edges = make_grid(8, rng)
+    selection = np.flatnonzero(rng.random(len(edges)) < 0.8)
+
+    expected, failed = reference_edges(co, edges.tolist(), selection.tolist(), MATRIX, PLANE_CO, PLANE_NO, **side)
+    indices, projected, result_failed, _ = projection.project_selection(
+        co, MATRIX, PLANE_CO, PLANE_NO, selection, edges=edges, **side)
+
+    assert np.allclose(apply(co, indices, projected), expected, rtol=0.0, atol=TOLERANCE)
+    assert result_failed.tolist() == sorted(failed)
+
+
+@pytest.mark.parametrize("side", SIDES)
+def test_project_selection_edge_chain(side):
+    # A chain in random edge order moves most vertices several times
+    rng = np.random.default_rng(1)
+    co = rng.normal(0.0, 3.0, (50, 3))
+    edges = np.column_stack((np.arange(49), np.arange(1, 50)))[rng.permutation(49)]
+    selection = np.arange(49)
+
+    expected, failed = reference_edges(co, edges.tolist(), selection.tolist(), MATRIX, PLANE_CO, PLANE_NO, **side)
+    indices, projected, result_failed, _ = projection.project_selection(
+        co, MATRIX, PLANE_CO, PLANE_NO, selection, edges=edges, **side)
+
+    assert np.allclose(apply(co, indices, projected), expected, rtol=0.0, atol=TOLERANCE)
+    assert result_failed.tolist() == sorted(failed)
+
+
+def test_project_selection_edges_failed():
+    co = np.array(((0.0, 0.0, 1.0), (1.0, 0.0, 1.0), (2.0, 0.0, 2.0), (2.0, 0.0, 2.0), (0.0, 1.0, -1.0), (0.0, 1.0, 1.0)))
+    edges = np.array(((0, 1), (2, 3), (4, 5)))
+
+    expected, failed = reference_edges(co, edges.tolist(), [0, 1, 2], np.eye(4), (0.0, 0.0, 0.0), (0.0, 0.0, 1.0), True, False, True)
+    indices, projected, result_failed, reasons = projection.project_selection(
+        co, np.eye(4), (0.0, 0.0, 0.0), (0.0, 0.0, 1.0), np.arange(3), edges=edges)
+
+    assert np.allclose(apply(co, indices, projected), expected, rtol=0.0, atol=TOLERANCE)
+    assert result_failed.tolist() == failed == [0, 1]
+    assert reasons.tolist() == [projection.PARALLEL, projection.DEGENERATE]
+
+
+@pytest.mark.parametrize("rule", ("ORDER", "SHORTEST", "PERPENDICULAR"))
+@pytest.mark.parametrize("side", SIDES)
+def test_edge_rules_on_disjoint_edges(rule, side):
+    # Without shared vertices every edge rule gives the result of the original loop
+    co, edges = make_disjoint_edges(100, np.random.default_rng(2))
+    selection = np.arange(len(edges))
+
+    expected, _ = reference_edges(co, edges.tolist(), selection.tolist(), MATRIX, PLANE_CO, PLANE_NO, **side)
+    indices, projected, _, _ = projection.project_selection(
+        co, MATRIX, PLANE_CO, PLANE_NO, selection, edges=edges, edge_rule=rule, **side)
+
+    assert np.allclose(apply(co, indices, projected), expected, rtol=0.0, atol=TOLERANCE)
+
+
+@pytest.mark.parametrize("rule", ("SHORTEST", "PERPENDICULAR"))
+@pytest.mark.parametrize("side", SIDES)
+def test_project_edge_vertices(rule, side):
+    rng = np.random.default_rng(3)
+    co, edges = make_grid(6, rng)
+    origin, normal = projection.plane_to_object_space(MATRIX, PLANE_CO, PLANE_NO)
+
+    moved, projected, hit, rows = projection.project_edge_vertices(co, edges, origin, normal, rule=rule, **side)
+
+    assert np.all(hit)
+    assert np.all(moved[1:] > moved[:-1])
+    # Every vertex ends up where the original loop would put it if its edge were the only one
+    for vertex, point, row in zip(moved.tolist(), projected, rows.tolist()):
+        expected, _ = reference_edges(co, edges.tolist(), [row], MATRIX, PLANE_CO, PLANE_NO, **side)
+        assert np.allclose(point, expected[vertex], rtol=0.0, atol=TOLERANCE)
+        assert vertex in edges[row]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_fit_plane(seed):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(-5.0, 5.0, (3, 3))
+
+    centroid, (left, front, up), rms, largest = projection.fit_plane(points)
+    axes = projection.plane_axes_from_points(*points)
+
+    assert np.allclose(up, reference_plane_normal(*points), rtol=0.0, atol=TOLERANCE)
+    assert np.allclose(axes[2], up, rtol=0.0, atol=TOLERANCE)
+    assert np.allclose(centroid, points.mean(axis=0))
+    assert rms < TOLERANCE and largest < TOLERANCE
+    assert np.allclose(np.array((left, front, up)) @ np.array((left, front, up)).T, np.eye(3), atol=TOLERANCE)
+
+
+def test_fit_plane_noisy_and_colinear():
+    rng = np.random.default_rng(4)
+    normal = np.array((0.2, -0.4, 0.9)) / np.linalg.norm((0.2, -0.4, 0.9))
+    points = rng.uniform(-5.0, 5.0, (500, 3))
+    points -= np.outer(points @ normal, normal)
+    points += np.outer(rng.normal(0.0, 0.01, len(points)), normal)
+
+    _, (_, _, up), rms, largest = projection.fit_plane(points)
+
+    assert abs(abs(up @ normal) - 1.0) < 1e-5
+    assert 0.005 < rms < 0.02 and largest >= rms
+    assert projection.fit_plane(np.outer(np.arange(5.0), (1.0, 2.0, 3.0))) is None
+
+
+@pytest.mark.parametrize("dtype", (np.float64, np.float32))
+@pytest.mark.parametrize("chunk_size", (1, 37, 100000))
+def test_project_mask_chunked_vertices(dtype, chunk_size):
+    rng = np.random.default_rng(5)
+    co = rng.uniform(-5.0, 5.0, (300, 3))
+    mask = rng.random(len(co)) < 0.6
+
+    expected, _ = reference_vertices(co, np.flatnonzero(mask).tolist(), MATRIX, PLANE_CO, PLANE_NO, PLANE_NO)
+    streamed = co.astype(dtype)
+    written, chunks, failed, _ = projection.project_mask_chunked(streamed, MATRIX, PLANE_CO, PLANE_NO, mask, chunk_size)
+
+    assert written == np.count_nonzero(mask)
+    assert chunks == len(set((np.flatnonzero(mask) // chunk_size).tolist()))
+    assert len(failed) == 0
+    assert np.allclose(streamed, expected, rtol=0.0, atol=TOLERANCE if dtype == np.float64 else 1e-4)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("chunk_size", (1, 37, 100000))
+@pytest.mark.parametrize("side", SIDES)
+def test_project_mask_chunked_edges(seed, chunk_size, side):
+    rng = np.random.default_rng(seed)
+    co, edges = make_grid(10, rng)
+    mask = rng.random(len(edges)) < 0.8
+
+    expected, failed = reference_edges(co, edges.tolist(), np.flatnonzero(mask).tolist(), MATRIX, PLANE_CO, PLANE_NO, **side)
+    streamed = co.copy()
+    _, _, result_failed, _ = projection.project_mask_chunked(
+        streamed, MATRIX, PLANE_CO, PLANE_NO, mask, chunk_size, edges=edges, **side)
+
+    assert np.allclose(streamed, expected, rtol=0.0, atol=TOLERANCE)
+    assert result_failed.tolist() == sorted(failed)
+
+
+def test_nearest_plane_with_unequal_normals():
+    # Plane A is 0.5 away with a short normal, plane B 0.2 away with a unit normal
+    co = np.array(((0.0, 0.0, 1.0),))
+    indices, projected, _, _ = projection.project_selection_on_planes(
+        co, np.eye(4), ((0.0, 0.0, 0.5), (-0.2, 0.0, 0.0)), ((0.0, 0.0, 0.2), (1.0, 0.0, 0.0)), (1, 1),
+        np.arange(1), use_nearest=True)
+
+    assert indices.tolist() == [0]
+    assert np.allclose(projected, ((-0.2, 0.0, 1.0),), rtol=0.0, atol=TOLERANCE)
+
+
+@pytest.mark.parametrize("use_nearest", (False, True))
+def test_project_selection_on_planes_vertices(use_nearest):
+    rng = np.random.default_rng(6)
+    mat = np.diag((2.0, 0.5, 1.5, 1.0))
+    mat[:3, 3] = (0.3, -0.1, 0.2)
+    co = rng.uniform(-3.0, 3.0, (100, 3))
+    plane_cos = ((0.0, 0.0, 1.0), (1.0, 0.0, 0.0), (0.0, -0.5, 0.0))
+    plane_nos = ((0.0, 0.3, 2.0), (0.5, 0.0, 0.1), (0.2, -3.0, 0.0))
+    sides = (1, 1, -1)
+
+    world = co @ mat[:3, :3].T + mat[:3, 3]
+    expected = co.copy()
+    for index, point in enumerate(world):
+        distances = [side * (point - plane_co) @ plane_no / np.linalg.norm(plane_no)
+                     for plane_co, plane_no, side in zip(plane_cos, plane_nos, sides)]
+        violated = [plane for plane, distance in enumerate(distances) if distance > 0]
+        if violated:
+            plane = min(violated, key=distances.__getitem__) if use_nearest else violated[0]
+            result, _ = reference_vertices(co, [index], mat, plane_cos[plane], plane_nos[plane], plane_nos[plane])
+            expected[index] = result[index]
+    indices, projected, failed, _ = projection.project_selection_on_planes(
+        co, mat, plane_cos, plane_nos, sides, np.arange(len(co)), use_nearest=use_nearest)
+
+    assert len(failed) == 0
+    assert np.allclose(apply(co, indices, projected), expected, rtol=0.0, atol=TOLERANCE)
+
+
+def reference_along_normals(co, selection, mat, plane_co, plane_no, normals):
+    """Vertex mode loop moving every vertex along its world space normal"""
+    mat = exact(mat)
+    to_object = inverted(mat)
+    # Normals go to world space with the inverse transpose of the object matrix
+    normal_matrix = [[to_object[col][row] for col in range(3)] for row in range(3)]
+    plane_co = [Fraction(x) for x in plane_co]
+    plane_no = [Fraction(x) for x in plane_no]
+    co = exact(co)
+    failed = []
+    for index, normal in zip(selection, exact(normals)):
+        start = transform(mat, co[index])
+        direction = [dot(row, normal) for row in normal_matrix]
+        hit = intersect_line_plane(start, [a + b for a, b in zip(start, direction)], plane_co, plane_no)
+        if hit is None:
+            failed.append(index)
+        else:
+            co[index] = transform(to_object, hit)
+    return np.array(co, dtype=np.float64), failed
+
+
+def reference_average_normals(normals, selection, edges):
+    """Every selected normal plus the normals of its selected neighbours, normalized"""
+    row_of = {index: row for row, index in enumerate(selection)}
+    summed = [list(normal) for normal in normals]
+    for a, b in edges:
+        if a in row_of and b in row_of:
+            summed[row_of[a]] = [x + y for x, y in zip(summed[row_of[a]], normals[row_of[b]])]
+            summed[row_of[b]] = [x + y for x, y in zip(summed[row_of[b]], normals[row_of[a]])]
+    result = []
+    for normal in summed:
+        length = sum(x * x for x in normal) ** 0.5
+        result.append([x / length for x in normal] if length > 0 else [0.0, 0.0, 0.0])
+    return np.array(result)
+
+
+def random_normals(count, rng):
+    normals = rng.normal(0.0, 1.0, (count, 3))
+    return normals / np.linalg.norm(normals, axis=1)[:, None]
+
+
+def test_average_normals():
+    rng = np.random.default_rng(7)
+    co, edges = make_grid(6, rng)
+    selection = np.flatnonzero(rng.random(len(co)) < 0.7)
+    normals = random_normals(len(selection), rng)
+
+    averaged = projection.average_normals(normals, selection, edges, len(co))
+
+    assert np.allclose(averaged, reference_average_normals(normals.tolist(), selection.tolist(), edges.tolist()), atol=TOLERANCE)
+
+
+def test_average_normals_cancelling():
+    # Opposite normals on the two ends of an edge cancel out, which leaves a zero direction
+    normals = np.array(((0.0, 0.0, 1.0), (0.0, 0.0, -1.0), (1.0, 0.0, 0.0)))
+    averaged = projection.average_normals(normals, np.array((0, 1, 4)), np.array(((0, 1), (1, 2), (2, 3))), 5)
+
+    assert np.all(np.isfinite(averaged))
+    assert np.array_equal(averaged, ((0.0, 0.0, 0.0), (0.0, 0.0, 0.0), (1.0, 0.0, 0.0)))
+
+    co = np.random.default_rng(8).uniform(-5.0, 5.0, (5, 3))
+    indices, _, failed, reasons = projection.project_along_normals(co, MATRIX, PLANE_CO, PLANE_NO, np.array((0, 1, 4)), averaged)
+    assert indices.tolist() == [4]
+    assert failed.tolist() == [0, 1]
+    assert np.all(reasons == projection.DEGENERATE)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_project_along_normals(seed):
+    rng = np.random.default_rng(seed)
+    mat = np.array(MATRIX) @ np.diag((2.0, 0.5, 1.5, 1.0))
+    co = rng.uniform(-5.0, 5.0, (100, 3))
+    selection = np.flatnonzero(rng.random(len(co)) < 0.7)
+    normals = random_normals(len(selection), rng)
+
+    expected, failed = reference_along_normals(co, selection.tolist(), mat, PLANE_CO, PLANE_NO, normals)
+    indices, projected, result_failed, _ = projection.project_along_normals(co, mat, PLANE_CO, PLANE_NO, selection, normals)
+
+    assert np.allclose(apply(co, indices, projected), expected, rtol=0.0, atol=TOLERANCE)
+    assert result_failed.tolist() == failed
+
+
+def test_project_along_normals_parallel():
+    # World space normals lying in the plane never reach it
+    mat = np.diag((2.0, 0.5, 1.5, 1.0))
+    normals = np.array(((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0), (1.0, 1.0, 0.0)))
+    co = np.random.default_rng(9).uniform(-5.0, 5.0, (4, 3))
+
+    expected, failed = reference_along_normals(co, [0, 1, 2, 3], mat, PLANE_CO, (0.0, 0.0, 1.0), normals)
+    indices, projected, result_failed, reasons = projection.project_along_normals(
+        co, mat, PLANE_CO, (0.0, 0.0, 1.0), np.arange(4), normals)
+
+    assert failed == [0, 1, 3]
+    assert result_failed.tolist() == failed
+    assert np.all(reasons == projection.PARALLEL)
+    assert np.allclose(apply(co, indices, projected), expected, rtol=0.0, atol=TOLERANCE)
+
+
+def test_moved_vertices_exact():
+    co = np.random.default_rng(10).uniform(-5.0, 5.0, (6, 3))
+    indices = np.array((0, 2, 3, 5))
+    projected = co[indices].copy()
+    projected[1, 2] += 0.5
+    projected[3, 0] -= 1e-12
+
+    result, result_projected, skipped = projection.moved_vertices(co, indices, projected, np.eye(4), 0.0)
+
+    assert result.tolist() == [2, 5]
+    assert np.array_equal(result_projected, projected[[1, 3]])
+    assert skipped == 2
+
+
+def test_moved_vertices_world_tolerance():
+    # 0.1 along X is 0.2 in world space with the object scaled by 2 along X
+    co = np.zeros((2, 3))
+    projected = np.array(((0.1, 0.0, 0.0), (0.0, 0.1, 0.0)))
+    mat = np.diag((2.0, 1.0, 1.0, 1.0))
+
+    result, _, skipped = projection.moved_vertices(co, np.arange(2), projected, mat, 0.15)
+
+    assert result.tolist() == [0]
+    assert skipped == 1
+
+
+def test_moved_vertices_parallel_misses():
+    # Vertices along normals parallel to the plane are left out before the comparison, so no NaN reaches it
+    co = np.array(((0.0, 0.0, 0.0), (1.0, 2.0, 3.0), (2.0, 1.0, 0.0), (1.0, 1.0, 1.0)))
+    normals = np.array(((0.0, 0.0, 1.0), (1.0, 0.0, 0.0), (0.0, 0.0, 1.0), (0.0, 0.0, 1.0)))
+
+    indices, projected, failed, _ = projection.project_along_normals(co, np.eye(4), (0.0, 0.0, 0.0), (0.0, 0.0, 1.0), np.arange(4), normals)
+    result, result_projected, skipped = projection.moved_vertices(co, indices, projected, np.eye(4), 0.0)
+
+    assert failed.tolist() == [1]
+    assert np.all(np.isfinite(result_projected))
+    assert result.tolist() == [3]
+    assert np.array_equal(result_projected, ((1.0, 1.0, 0.0),))
+    assert skipped == 2
+
+
+@pytest.mark.parametrize("rule", ("SEQUENTIAL", "ORDER"))
+def test_moved_vertices_edges(rule):
+    # Edges crossing the plane with their positive vertex already on it leave both ends in place
+    co = np.array(((0.0, 0.0, 0.0), (0.0, 0.0, -1.0), (1.0, 0.0, -1.0), (2.0, 0.0, 1.0), (2.0, 0.0, -1.0)))
+    edges = np.array(((0, 1), (0, 2), (3, 4)))
+
+    indices, projected, _, _ = projection.project_selection(
+        co, np.eye(4), (0.0, 0.0, 0.0), (0.0, 0.0, 1.0), np.arange(3), edges=edges, edge_rule=rule)
+    result, result_projected, skipped = projection.moved_vertices(co, indices, projected, np.eye(4), 0.0)
+
+    assert result.tolist() == [3]
+    assert np.allclose(result_projected, ((2.0, 0.0, 0.0),), rtol=0.0, atol=TOLERANCE)
+    assert skipped == 1